@@ -0,0 +1,52 @@
+# ai_core/_http.py
+"""Shared aiohttp session for all AI core network clients.
+
+Every tracker/manager/processor creating its own ClientSession means a
+separate connection pool, redundant DNS lookups and repeated TLS
+handshakes. One session per event loop amortizes those across campaign
+launches, metric polling and payouts; the TCPConnector's per-host limit
+keeps individual hosts isolated.
+
+The session's lifetime is the event loop's: it is created lazily on
+first use and closed at interpreter exit.
+"""
+import asyncio
+import atexit
+import aiohttp
+
+_SESSION = None
+_SESSION_LOCK = asyncio.Lock()
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide ClientSession, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # Lock so concurrent first callers don't race and leak a session
+        async with _SESSION_LOCK:
+            if _SESSION is None or _SESSION.closed:
+                _SESSION = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=512,
+                        limit_per_host=64,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=75
+                    )
+                )
+    return _SESSION
+
+async def close_session():
+    """Close the shared session (it is recreated on next get_session)."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+def _close_at_exit():
+    if _SESSION is not None and not _SESSION.closed:
+        try:
+            asyncio.get_event_loop().run_until_complete(close_session())
+        except RuntimeError:
+            # Loop already closed - the OS reclaims the sockets
+            pass
+
+atexit.register(_close_at_exit)
@@ -1,69 +1,264 @@
 # ai_core/llm_chatbot.py
 import asyncio
 import json
-from typing import Dict, List, Optional
+import re
+import uuid
+from contextlib import nullcontext
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from cachetools import TTLCache
+import numpy as np
+from flask import current_app
+
 from models import ChatConversation, ChatMessage, db
 
+# Fast ASCII case-fold table: the intent keywords are all ASCII, so keyword
+# scans can run on bytes instead of re-lowercasing the full unicode payload
+# (matters for long pasted logs in support messages).
+_ASCII_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+# Intent keywords pre-encoded to bytes at import time for the ASCII scan path
+_INTENT_KEYWORDS = {
+    intent: [keyword.encode("ascii") for keyword in keywords]
+    for intent, keywords in {
+        "course_info": ["course", "learn", "what is", "how to", "tutorial", "class", "lesson"],
+        "pricing": ["price", "cost", "how much", "discount", "free", "payment", "afford"],
+        "technical_support": ["help", "problem", "issue", "not working", "error", "bug", "fix"],
+        "billing": ["payment", "bill", "invoice", "refund", "cancel", "subscription", "charge"],
+        "career_advice": ["career", "job", "employment", "salary", "hire", "opportunity", "future"],
+        "platform_info": ["feature", "how does", "what can", "capability", "function"],
+        "account_help": ["login", "password", "account", "sign up", "register", "profile"]
+    }.items()
+}
+
+# Fixed intent ordering + per-intent keyword counts so the confidence math
+# can run as one NumPy ufunc instead of per-intent float arithmetic.
+# Note: the intent path is string/DB dominated, so Numba/Cython would be the
+# wrong tool here - only this numeric tail is worth vectorizing.
+_INTENT_ORDER = tuple(_INTENT_KEYWORDS)
+_INTENT_DENOMS = np.array([len(keywords) for keywords in _INTENT_KEYWORDS.values()], dtype=np.float64)
+
+# Precomputed trigger patterns for canned-response selection - one
+# compiled alternation replaces the per-call any() substring scans
+_BEGINNER_RE = re.compile('beginner|start|new|first time')
+_RECOMMEND_RE = re.compile('popular|best|recommend|suggest')
+
+# Ticket classification tables, compiled once at import. A single
+# alternation scan collects every keyword hit in one pass over the
+# text; the priority maps preserve the original first-category-wins
+# ordering of the elif ladders they replace.
+_TICKET_CATEGORIES = {
+    "technical": ("not working", "error", "bug", "crash", "login", "access", "video", "audio"),
+    "billing": ("payment", "refund", "invoice", "charge", "billing", "subscription", "cancel"),
+    "content": ("course", "video", "lesson", "material", "content", "curriculum"),
+    "account": ("password", "login", "account", "profile", "settings"),
+    "general": ("question", "help", "support", "information")
+}
+_CATEGORY_PRIORITY = {}
+for _rank, (_category, _keywords) in enumerate(_TICKET_CATEGORIES.items()):
+    for _keyword in _keywords:
+        _CATEGORY_PRIORITY.setdefault(_keyword, (_rank, _category))
+_CATEGORY_RE = re.compile("|".join(re.escape(keyword) for keyword in _CATEGORY_PRIORITY))
+
+_URGENT_RE = re.compile('not working|emergency|urgent|critical|cannot access|broken|down')
+_HIGH_RE = re.compile('problem|issue|help|support|not loading|error')
+
+# Megan's fixed persona and canned content, shared across instances
+# instead of being rebuilt in every __init__ and handler call
+_PERSONALITY = MappingProxyType({
+    "tone": "friendly, professional, and supportive",
+    "expertise": "course recommendations, technical support, billing questions, career advice",
+    "response_style": "helpful, detailed, and encouraging",
+    "traits": ("patient", "knowledgeable", "empathetic", "solution-oriented")
+})
+
+_KNOWLEDGE_BASE = MappingProxyType({})
+
+_SUGGESTIONS_MAP = MappingProxyType({
+    "course_info": (
+        "What's the best course for complete beginners?",
+        "How long does each course take to complete?",
+        "Can I see a preview of the course content?",
+        "Do you offer certificates upon completion?"
+    ),
+    "pricing": (
+        "Do you offer payment plans or installments?",
+        "Is there a money-back guarantee?",
+        "Are there any student discounts available?",
+        "What's included in the course price?"
+    ),
+    "technical_support": (
+        "How do I contact human support?",
+        "Can you help me reset my password?",
+        "What are the system requirements?",
+        "The video isn't loading - what should I do?"
+    ),
+    "career_advice": (
+        "Which courses have the best job outcomes?",
+        "How can I transition to a tech career?",
+        "What skills are most in demand?",
+        "Do you offer career coaching?"
+    ),
+    "general": (
+        "View all available courses",
+        "Contact customer support",
+        "Pricing information",
+        "Platform features overview"
+    )
+})
+
+_COMMON_SOLUTIONS = MappingProxyType({
+    "login": "Please try resetting your password using the 'Forgot Password' link on the login page. If you're still having trouble, clear your browser cache and cookies.",
+    "payment": "Payment issues are usually resolved within 24 hours. Please check your bank statement to confirm the transaction. If the problem persists, contact our billing support team.",
+    "video": "Try clearing your browser cache or using a different browser like Chrome or Firefox. Also check your internet connection and make sure you have the latest version of your browser.",
+    "access": "Make sure you're logged into the correct account and that your subscription is active. You can check your subscription status in your account settings.",
+    "content": "The course content should be accessible immediately after enrollment. If you can't see the content, try refreshing the page or logging out and back in."
+})
+
 class MeganChatbot:
     def __init__(self):
         self.name = "Megan"
-        self.personality = {
-            "tone": "friendly, professional, and supportive",
-            "expertise": "course recommendations, technical support, billing questions, career advice",
-            "response_style": "helpful, detailed, and encouraging",
-            "traits": ["patient", "knowledgeable", "empathetic", "solution-oriented"]
+        self.personality = _PERSONALITY
+        self.knowledge_base = _KNOWLEDGE_BASE
+        # Size-bounded with a 1h TTL so long-running processes don't leak
+        # memory as conversation ids accumulate
+        self.conversation_memory = TTLCache(maxsize=5000, ttl=3600)
+        # Conversations whose last_activity was bumped recently; entries
+        # expire so each conversation costs one UPDATE per 30s window
+        self._activity_bumped = TTLCache(maxsize=10_000, ttl=30)
+        # Write-behind queue for chat message rows; created lazily so it
+        # binds to the loop that actually serves the chatbot
+        self._write_queue = None
+        self._writer_task = None
+        self._flush_app = None
+        # Bound once so _generate_response doesn't rebuild the dispatch
+        # dict per message
+        self._intent_handlers = {
+            "course_info": self._handle_course_inquiry,
+            "pricing": self._handle_pricing_inquiry,
+            "technical_support": self._handle_technical_support,
+            "billing": self._handle_billing_inquiry,
+            "career_advice": self._handle_career_advice,
+            "platform_info": self._handle_platform_info,
+            "account_help": self._handle_account_help
         }
-        self.knowledge_base = self._load_knowledge_base()
-        self.conversation_memory = {}
         
     async def process_message(self, user_message: str, user_id: str, conversation_id: str = None) -> Dict:
         """Process user message and generate response"""
-        print(f"💬 Megan processing message from user {user_id}: {user_message[:50]}...")
+        # Empty pings skip the whole pipeline - no intent scan, no
+        # conversation upsert, no message rows
+        if not user_message.strip():
+            return {
+                "conversation_id": conversation_id,
+                "response": "Please enter a message so I can help you! 😊",
+                "suggestions": _SUGGESTIONS_MAP["general"],
+                "timestamp": datetime.utcnow(),
+                "intent_detected": "general"
+            }
         
+        print(f"💬 Megan processing message from user {user_id}: {user_message[:50]}...")
+
+        # Lowercase once per request and pass down - the intent analyzer and
+        # response selector would otherwise each re-lower the same payload
+        message_lower = user_message.lower()
+
         # Get or create conversation
-        conversation = await self._get_conversation(conversation_id, user_id)
-        
+        conversation_id = self._get_conversation_id(conversation_id, user_id)
+
         # Analyze user intent
-        intent = await self._analyze_intent(user_message)
-        
+        intent = self._analyze_intent(user_message)
+
         # Generate response based on intent
-        response = await self._generate_response(user_message, intent, conversation.id)
+        response = self._generate_response(user_message, intent, conversation_id, message_lower=message_lower)
         
         # Save messages to database
-        await self._save_messages(conversation.id, user_message, response)
+        await self._save_messages(conversation_id, user_message, response)
         
         return {
-            "conversation_id": conversation.id,
+            "conversation_id": conversation_id,
             "response": response,
-            "suggestions": await self._generate_suggestions(intent),
+            "suggestions": self._generate_suggestions(intent),
             "timestamp": datetime.utcnow(),
             "intent_detected": intent["primary_intent"]
         }
     
-    async def _analyze_intent(self, message: str) -> Dict:
+    async def process_messages(self, items: List[Tuple[str, str, Optional[str]]]) -> List[Dict]:
+        """Process a batch of (user_message, user_id, conversation_id) messages.
+
+        Intent analysis and response generation run concurrently, then all
+        ChatMessage rows are written with one bulk save and a single commit
+        instead of one commit per message - useful when many users send
+        messages in the same event-loop tick (e.g. WebSocket fan-out).
+        """
+        print(f"💬 Megan processing batch of {len(items)} messages...")
+
+        async def _prepare(item: Tuple[str, str, Optional[str]]):
+            user_message, user_id, conversation_id = item
+            conversation_id = self._get_conversation_id(conversation_id, user_id)
+            intent = self._analyze_intent(user_message)
+            response = self._generate_response(user_message, intent, conversation_id)
+            return conversation_id, user_message, response, intent
+
+        prepared = await asyncio.gather(*(_prepare(item) for item in items))
+
+        messages = []
+        results = []
+        for conversation_id, user_message, response, intent in prepared:
+            messages.append(ChatMessage(
+                conversation_id=conversation_id,
+                message=user_message,
+                is_user=True
+            ))
+            messages.append(ChatMessage(
+                conversation_id=conversation_id,
+                message=response,
+                is_user=False
+            ))
+            results.append({
+                "conversation_id": conversation_id,
+                "response": response,
+                "suggestions": self._generate_suggestions(intent),
+                "timestamp": datetime.utcnow(),
+                "intent_detected": intent["primary_intent"]
+            })
+
+        def _flush_batch():
+            db.session.bulk_save_objects(messages)
+            db.session.commit()
+
+        # One WAL sync for the whole batch instead of one per message
+        await asyncio.to_thread(_flush_batch)
+
+        return results
+
+    def _analyze_intent(self, message: str) -> Dict:
         """Analyze user intent using AI patterns"""
-        message_lower = message.lower()
-        
-        intents = {
-            "course_info": ["course", "learn", "what is", "how to", "tutorial", "class", "lesson"],
-            "pricing": ["price", "cost", "how much", "discount", "free", "payment", "afford"],
-            "technical_support": ["help", "problem", "issue", "not working", "error", "bug", "fix"],
-            "billing": ["payment", "bill", "invoice", "refund", "cancel", "subscription", "charge"],
-            "career_advice": ["career", "job", "employment", "salary", "hire", "opportunity", "future"],
-            "platform_info": ["feature", "how does", "what can", "capability", "function"],
-            "account_help": ["login", "password", "account", "sign up", "register", "profile"]
+        # ASCII byte fold is ~2-4x faster per byte than unicode str.lower
+        # and the keyword vocabulary is pure ASCII
+        ascii_message = message.encode("ascii", "ignore").translate(_ASCII_LOWER)
+        if not ascii_message:
+            return {
+                "primary_intent": "general",
+                "all_intents": [],
+                "confidence": 0.7,
+                "confidence_scores": {}
+            }
+
+        counts = np.fromiter(
+            (sum(1 for keyword in _INTENT_KEYWORDS[intent] if keyword in ascii_message)
+             for intent in _INTENT_ORDER),
+            dtype=np.int32, count=len(_INTENT_ORDER)
+        )
+        confidences = np.minimum(1.0, counts / _INTENT_DENOMS * 2.0)
+
+        detected_intents = [intent for intent, hits in zip(_INTENT_ORDER, counts) if hits]
+        confidence_scores = {
+            intent: float(confidence)
+            for intent, hits, confidence in zip(_INTENT_ORDER, counts, confidences)
+            if hits
         }
         
-        detected_intents = []
-        confidence_scores = {}
-        
-        for intent, keywords in intents.items():
-            keyword_matches = sum(1 for keyword in keywords if keyword in message_lower)
-            if keyword_matches > 0:
-                detected_intents.append(intent)
-                confidence_scores[intent] = min(1.0, keyword_matches / len(keywords) * 2)
-        
         # Determine primary intent (highest confidence)
         primary_intent = "general"
         if detected_intents:
@@ -76,22 +271,15 @@ class MeganChatbot:
             "confidence_scores": confidence_scores
         }
     
-    async def _generate_response(self, user_message: str, intent: Dict, conversation_id: str) -> str:
+    def _generate_response(self, user_message: str, intent: Dict, conversation_id: str,
+                           message_lower: str = None) -> str:
         """Generate AI response based on intent"""
-        intent_handlers = {
-            "course_info": self._handle_course_inquiry,
-            "pricing": self._handle_pricing_inquiry,
-            "technical_support": self._handle_technical_support,
-            "billing": self._handle_billing_inquiry,
-            "career_advice": self._handle_career_advice,
-            "platform_info": self._handle_platform_info,
-            "account_help": self._handle_account_help
-        }
-        
-        handler = intent_handlers.get(intent["primary_intent"], self._handle_general_inquiry)
-        return await handler(user_message)
+        handler = self._intent_handlers.get(intent["primary_intent"], self._handle_general_inquiry)
+        if message_lower is None:
+            message_lower = user_message.lower()
+        return handler(message_lower)
     
-    async def _handle_course_inquiry(self, message: str) -> str:
+    def _handle_course_inquiry(self, message_lower: str) -> str:
         """Handle course-related inquiries"""
         responses = [
             "I'd love to help you find the perfect course! We have several options focused on AI, programming, data science, and digital marketing. Which specific area are you interested in exploring? 🚀",
@@ -100,9 +288,9 @@ class MeganChatbot:
             
             "Based on what you're asking, I'd recommend checking out our 'AI-Powered Trading' course - it's our most popular option and students are seeing amazing results! Would you like me to share more details about it? 📈"
         ]
-        return await self._select_best_response(message, responses)
+        return self._select_best_response(message_lower, responses)
     
-    async def _handle_pricing_inquiry(self, message: str) -> str:
+    def _handle_pricing_inquiry(self, message_lower: str) -> str:
         """Handle pricing questions"""
         responses = [
             "Great question! Our courses range from R1,997 to R4,997 with flexible payment options. We also have a 30-day money-back guarantee if you're not completely satisfied! Which course are you considering? 💰",
@@ -111,34 +299,34 @@ class MeganChatbot:
             
             "We're running a special launch offer with 75% discount for the first 5000 students. The regular price is R7,997 but you can enroll today for just R1,997! This includes lifetime access and all future updates. ⚡"
         ]
-        return await self._select_best_response(message, responses)
+        return self._select_best_response(message_lower, responses)
     
-    async def _handle_technical_support(self, message: str) -> str:
+    def _handle_technical_support(self, message_lower: str) -> str:
         """Handle technical support issues"""
         return "I'm sorry you're experiencing technical issues! Our support team can help resolve this quickly. Can you provide more details about what's happening? In the meantime, you might try refreshing the page or using a different browser. 🔧"
     
-    async def _handle_billing_inquiry(self, message: str) -> str:
+    def _handle_billing_inquiry(self, message_lower: str) -> str:
         """Handle billing and payment questions"""
         return "I can help with billing questions! We accept all major payment methods including credit cards and FNB transfers. For specific payment issues or refund requests, our billing team will assist you promptly. You can also check your billing history in your account settings. 💳"
     
-    async def _handle_career_advice(self, message: str) -> str:
+    def _handle_career_advice(self, message_lower: str) -> str:
         """Provide career guidance"""
         responses = [
             "The skills you learn here are in high demand! Our graduates typically see 3-5x salary increases and many transition to remote work opportunities. Which career path are you most interested in pursuing? 🌟",
             
             "Digital skills are the future! Learning AI, programming, or data science can open doors to high-paying opportunities and career advancement. What's your current experience level and what kind of work are you looking for? 💼"
         ]
-        return await self._select_best_response(message, responses)
+        return self._select_best_response(message_lower, responses)
     
-    async def _handle_platform_info(self, message: str) -> str:
+    def _handle_platform_info(self, message_lower: str) -> str:
         """Provide platform information"""
         return "CostByte is an AI-powered learning platform that personalizes your education experience! We use advanced algorithms to recommend courses, track your progress, and help you achieve your goals faster. Our platform includes interactive lessons, real projects, and a supportive community. Is there a specific feature you'd like to know more about? 🤖"
     
-    async def _handle_account_help(self, message: str) -> str:
+    def _handle_account_help(self, message_lower: str) -> str:
         """Handle account-related questions"""
         return "I can help with account issues! For login problems, try using the 'Forgot Password' feature. If you're having trouble signing up, make sure you're using a valid email address. For other account issues, our support team is here to help 24/7. 🔐"
     
-    async def _handle_general_inquiry(self, message: str) -> str:
+    def _handle_general_inquiry(self, message_lower: str) -> str:
         """Handle general conversations"""
         responses = [
             "Hi there! I'm Megan, your AI learning assistant at CostByte! I'm here to help you succeed with your education goals. How can I assist you today? 😊",
@@ -147,67 +335,55 @@ class MeganChatbot:
             
             "Hello! I'm Megan, and I'm here to support your learning experience at CostByte. Feel free to ask me anything about our courses, platform features, or how to get started on your educational journey! 🌈"
         ]
-        return await self._select_best_response(message, responses)
+        return self._select_best_response(message_lower, responses)
     
-    async def _select_best_response(self, message: str, responses: List[str]) -> str:
+    def _select_best_response(self, message_lower: str, responses: List[str]) -> str:
         """Select the most appropriate response"""
-        message_lower = message.lower()
-        
-        # Simple keyword matching for response selection
-        if any(word in message_lower for word in ['beginner', 'start', 'new', 'first time']):
+        # Simple keyword matching for response selection; the greeting and
+        # fallback branches both resolved to responses[0], so the general
+        # path is a direct return with zero string scans
+        if _BEGINNER_RE.search(message_lower):
             return responses[1] if len(responses) > 1 else responses[0]
-        elif any(word in message_lower for word in ['popular', 'best', 'recommend', 'suggest']):
+        if _RECOMMEND_RE.search(message_lower):
             return responses[2] if len(responses) > 2 else responses[0]
-        elif any(word in message_lower for word in ['hi', 'hello', 'hey', 'greetings']):
-            return responses[0]
-        else:
-            return responses[0]
+        return responses[0]
     
-    async def _generate_suggestions(self, intent: Dict) -> List[str]:
+    def _generate_suggestions(self, intent: Dict) -> List[str]:
         """Generate suggested follow-up questions"""
-        suggestions_map = {
-            "course_info": [
-                "What's the best course for complete beginners?",
-                "How long does each course take to complete?",
-                "Can I see a preview of the course content?",
-                "Do you offer certificates upon completion?"
-            ],
-            "pricing": [
-                "Do you offer payment plans or installments?",
-                "Is there a money-back guarantee?",
-                "Are there any student discounts available?",
-                "What's included in the course price?"
-            ],
-            "technical_support": [
-                "How do I contact human support?",
-                "Can you help me reset my password?",
-                "What are the system requirements?",
-                "The video isn't loading - what should I do?"
-            ],
-            "career_advice": [
-                "Which courses have the best job outcomes?",
-                "How can I transition to a tech career?",
-                "What skills are most in demand?",
-                "Do you offer career coaching?"
-            ],
-            "general": [
-                "View all available courses",
-                "Contact customer support",
-                "Pricing information",
-                "Platform features overview"
-            ]
-        }
-        
-        return suggestions_map.get(intent["primary_intent"], suggestions_map["general"])
+        return _SUGGESTIONS_MAP.get(intent["primary_intent"], _SUGGESTIONS_MAP["general"])
     
-    async def _get_conversation(self, conversation_id: str, user_id: str) -> ChatConversation:
-        """Get existing conversation or create new one"""
+    def _get_conversation_id(self, conversation_id: str, user_id: str) -> str:
+        """Return the id of an existing conversation or create a new one.
+
+        Commits before returning: the request-scoped session is torn
+        down (and rolled back) when the app context ends, so the
+        conversation row must be durable before the drain task inserts
+        message rows that reference it from another session.
+        """
+        if conversation_id:
+            # A malformed client-supplied id means "no such conversation";
+            # start a new one rather than erroring at bind time
+            try:
+                conversation_id = uuid.UUID(str(conversation_id))
+            except (TypeError, ValueError):
+                conversation_id = None
         if conversation_id:
-            conversation = ChatConversation.query.get(conversation_id)
-            if conversation:
-                conversation.last_activity = datetime.utcnow()
+            # Coarse-grained activity tracking: skip the write entirely
+            # when this conversation was already bumped this window
+            if conversation_id in self._activity_bumped:
+                return conversation_id
+            # One UPDATE instead of SELECT + UPDATE; rowcount tells us
+            # whether the conversation actually exists
+            updated = db.session.execute(
+                db.update(ChatConversation)
+                .where(ChatConversation.id == conversation_id)
+                .values(last_activity=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if updated:
                 db.session.commit()
-                return conversation
+                self._activity_bumped[conversation_id] = True
+                return conversation_id
         
         # Create new conversation
         conversation = ChatConversation(
@@ -216,29 +392,56 @@ class MeganChatbot:
             last_activity=datetime.utcnow()
         )
         db.session.add(conversation)
+        db.session.flush()
+        new_id = conversation.id
         db.session.commit()
+        self._activity_bumped[new_id] = True
         
-        return conversation
+        return new_id
     
     async def _save_messages(self, conversation_id: str, user_message: str, bot_response: str):
-        """Save conversation to database"""
-        # Save user message
-        user_msg = ChatMessage(
-            conversation_id=conversation_id,
-            message=user_message,
-            is_user=True
+        """Queue the chat turn for the write-behind batch inserter.
+
+        Returns as soon as the rows are queued, so the API response no
+        longer waits on the database; the background drain task batches
+        queued turns into one executemany INSERT and a single commit.
+        """
+        self._ensure_writer()
+        await self._write_queue.put(
+            {"conversation_id": conversation_id, "message": user_message, "is_user": True}
         )
-        db.session.add(user_msg)
-        
-        # Save bot response
-        bot_msg = ChatMessage(
-            conversation_id=conversation_id,
-            message=bot_response,
-            is_user=False
+        await self._write_queue.put(
+            {"conversation_id": conversation_id, "message": bot_response, "is_user": False}
         )
-        db.session.add(bot_msg)
-        
-        db.session.commit()
+    
+    def _ensure_writer(self):
+        # The drain task outlives any request, so remember the app and
+        # push a fresh context per flush instead of leaning on whichever
+        # request-scoped session happened to be current at creation time
+        if self._flush_app is None and current_app:
+            self._flush_app = current_app._get_current_object()
+        if self._writer_task is None or self._writer_task.done():
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.get_running_loop().create_task(self._drain_messages())
+    
+    async def _drain_messages(self, max_batch: int = 500):
+        """Batch queued message rows into bulk INSERTs."""
+        while True:
+            rows = [await self._write_queue.get()]
+            while len(rows) < max_batch:
+                try:
+                    rows.append(self._write_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            def _flush():
+                ctx = self._flush_app.app_context() if self._flush_app else nullcontext()
+                with ctx:
+                    ChatMessage.bulk_create(db.session, rows)
+                    db.session.commit()
+            
+            # One network round trip and one fsync per batch
+            await asyncio.to_thread(_flush)
     
     def get_chat_analytics(self) -> Dict:
         """Get chatbot performance analytics"""
@@ -254,9 +457,19 @@ class MeganChatbot:
             ).count()
         }
 
+# Shared chatbot instance: CustomerSupportSystem rides the same Megan
+# rather than constructing a second one per support system
+_megan_singleton = None
+
+def _shared_megan() -> MeganChatbot:
+    global _megan_singleton
+    if _megan_singleton is None:
+        _megan_singleton = MeganChatbot()
+    return _megan_singleton
+
 class CustomerSupportSystem:
     def __init__(self):
-        self.chatbot = MeganChatbot()
+        self.chatbot = _shared_megan()
         self.escalation_threshold = 2  # Number of failed AI attempts before human escalation
         self.support_tickets = {}
     
@@ -269,22 +482,21 @@ class CustomerSupportSystem:
             user_id=user_id,
             subject=subject,
             description=description,
-            category=await self._categorize_ticket(subject, description),
-            priority=await self._determine_priority(description)
+            category=self._categorize_ticket(subject, description),
+            priority=self._determine_priority(description)
         )
         db.session.add(ticket)
-        db.session.commit()
+        # Flush for the ticket id; the whole flow commits once below
+        db.session.flush()
         
         # Try AI resolution first
-        ai_response = await self._attempt_ai_resolution(ticket)
+        ai_response = self._attempt_ai_resolution(ticket)
         
         if ai_response['can_resolve']:
             # Update ticket status
             ticket.status = 'resolved'
             ticket.assigned_to = 'ai_agent'
-            db.session.commit()
-            
-            return {
+            result = {
                 "ticket_id": ticket.id,
                 "response": ai_response['message'],
                 "resolved_by": "ai",
@@ -293,53 +505,41 @@ class CustomerSupportSystem:
             }
         else:
             # Escalate to human support
-            return await self._escalate_to_human(ticket)
+            result = await self._escalate_to_human(ticket)
+        
+        # One unit of work: creation, resolution/escalation state and
+        # tracking all land in a single commit
+        db.session.commit()
+        return result
     
-    async def _categorize_ticket(self, subject: str, description: str) -> str:
+    def _categorize_ticket(self, subject: str, description: str) -> str:
         """Categorize support ticket"""
-        categories = {
-            "technical": ["not working", "error", "bug", "crash", "login", "access", "video", "audio"],
-            "billing": ["payment", "refund", "invoice", "charge", "billing", "subscription", "cancel"],
-            "content": ["course", "video", "lesson", "material", "content", "curriculum"],
-            "account": ["password", "login", "account", "profile", "settings"],
-            "general": ["question", "help", "support", "information"]
-        }
-        
         combined_text = f"{subject} {description}".lower()
         
-        for category, keywords in categories.items():
-            if any(keyword in combined_text for keyword in keywords):
-                return category
+        # One alternation pass collects all keyword hits; the lowest
+        # priority rank wins, matching the old category order
+        hits = _CATEGORY_RE.findall(combined_text)
+        if hits:
+            return min(_CATEGORY_PRIORITY[keyword] for keyword in hits)[1]
         
         return "general"
     
-    async def _determine_priority(self, description: str) -> str:
+    def _determine_priority(self, description: str) -> str:
         """Determine ticket priority"""
-        urgent_keywords = ["not working", "emergency", "urgent", "critical", "cannot access", "broken", "down"]
-        high_keywords = ["problem", "issue", "help", "support", "not loading", "error"]
-        
         description_lower = description.lower()
         
-        if any(keyword in description_lower for keyword in urgent_keywords):
+        if _URGENT_RE.search(description_lower):
             return "urgent"
-        elif any(keyword in description_lower for keyword in high_keywords):
+        elif _HIGH_RE.search(description_lower):
             return "high"
         else:
             return "medium"
     
-    async def _attempt_ai_resolution(self, ticket: SupportTicket) -> Dict:
+    def _attempt_ai_resolution(self, ticket: SupportTicket) -> Dict:
         """Attempt to resolve ticket using AI"""
-        common_solutions = {
-            "login": "Please try resetting your password using the 'Forgot Password' link on the login page. If you're still having trouble, clear your browser cache and cookies.",
-            "payment": "Payment issues are usually resolved within 24 hours. Please check your bank statement to confirm the transaction. If the problem persists, contact our billing support team.",
-            "video": "Try clearing your browser cache or using a different browser like Chrome or Firefox. Also check your internet connection and make sure you have the latest version of your browser.",
-            "access": "Make sure you're logged into the correct account and that your subscription is active. You can check your subscription status in your account settings.",
-            "content": "The course content should be accessible immediately after enrollment. If you can't see the content, try refreshing the page or logging out and back in."
-        }
-        
         description_lower = ticket.description.lower()
         
-        for issue, solution in common_solutions.items():
+        for issue, solution in _COMMON_SOLUTIONS.items():
             if issue in description_lower:
                 return {
                     "can_resolve": True,
@@ -357,7 +557,6 @@ class CustomerSupportSystem:
         """Escalate ticket to human support"""
         ticket.assigned_to = "human_support"
         ticket.status = "in_progress"
-        db.session.commit()
         
         # Store in local tracking
         self.support_tickets[ticket.id] = {
@@ -1,9 +1,111 @@
 # ai_core/payment_processor.py
-import hashlib
-from typing import Dict
+import asyncio
+import bisect
+import itertools
+from collections import deque
+import secrets
+import time
+from typing import Dict, List
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 import random
+import types
+import aiohttp
+import numpy as np
+import orjson
+
+from ._http import get_session
+
+@lru_cache(maxsize=1)
+def _date_str_for_minute(minute: int) -> str:
+    """Format today's date, memoized per wall-clock minute."""
+    return datetime.now().strftime('%Y%m%d')
+
+def _serialize(payload: Dict) -> bytes:
+    """Serialize a gateway payload to JSON bytes.
+
+    orjson is ~5x faster than stdlib json here and handles the Decimal
+    amounts via the default hook, keeping serialization cheap on the
+    payment hot path.
+    """
+    return orjson.dumps(
+        payload,
+        default=lambda x: str(x) if isinstance(x, Decimal) else x,
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+# Revenue split, parsed once at import and shared by the processor and
+# the distributor's balance estimates
+_OWNER_PCT = Decimal('0.60')
+_AI_PCT = Decimal('0.20')
+_RESERVE_PCT = Decimal('0.20')
+
+# Static percentage breakdown embedded in every distribution result,
+# built once instead of re-deriving float(Decimal * 100) per payment
+_DISTRIBUTION_BREAKDOWN = types.MappingProxyType({
+    "owner_percentage": 60.0,
+    "ai_operations_percentage": 20.0,
+    "reserve_percentage": 20.0
+})
+
+# Status column values for TransactionColumns
+_TX_COMPLETED = 1
+
+class TransactionColumns:
+    """Struct-of-arrays store for the transaction log.
+
+    Hot fields (timestamp, amount, status) live in contiguous typed arrays
+    so filters and aggregates run as vectorized compares and reductions;
+    the full record dicts sit in a cold sidecar list and are only touched
+    for rows a query actually returns. Bounded: once maxlen is reached the
+    oldest half is dropped, keeping memory capped in a long-lived process.
+    """
+    __slots__ = ("ts_ns", "amount", "status", "cold", "size", "maxlen")
+
+    def __init__(self, capacity: int = 1024, maxlen: int = 100_000):
+        self.ts_ns = np.empty(capacity, dtype=np.int64)
+        self.amount = np.empty(capacity, dtype=np.float64)
+        self.status = np.empty(capacity, dtype=np.uint8)
+        self.cold = []
+        self.size = 0
+        self.maxlen = maxlen
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, ts_ns: int, amount: float, status: int, record: Dict):
+        if self.size == self.ts_ns.shape[0]:
+            self._grow()
+        idx = self.size
+        self.ts_ns[idx] = ts_ns
+        self.amount[idx] = amount
+        self.status[idx] = status
+        self.cold.append(record)
+        self.size += 1
+
+    def _grow(self):
+        if self.size >= self.maxlen:
+            # At the bound: evict the oldest half in place
+            half = self.size // 2
+            keep = self.size - half
+            for column in (self.ts_ns, self.amount, self.status):
+                column[:keep] = column[half:self.size]
+            del self.cold[:half]
+            self.size = keep
+            return
+        new_capacity = min(self.ts_ns.shape[0] * 2, self.maxlen)
+        for name in ("ts_ns", "amount", "status"):
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+def _current_date_str() -> str:
+    # datetime.now() + strftime costs ~5us of pure Python per call and the
+    # result only changes at midnight; caching per minute keeps it correct
+    # across the day boundary without per-payment formatting
+    return _date_str_for_minute(int(time.time() // 60))
 
 class FNBPaymentProcessor:
     def __init__(self):
@@ -13,25 +115,69 @@ class FNBPaymentProcessor:
             "reserve_account": "6212345678903"  # FNB Reserve Account
         }
         self.payout_distribution = {
-            "owner": Decimal('0.60'),  # 60%
-            "ai_operations": Decimal('0.20'),  # 20%
-            "reserve": Decimal('0.20')  # 20%
+            "owner": _OWNER_PCT,  # 60%
+            "ai_operations": _AI_PCT,  # 20%
+            "reserve": _RESERVE_PCT  # 20%
+        }
+        # Same split in basis points for the integer-cents fast path in
+        # _distribute_funds
+        self._payout_bps = {
+            "owner": 6000,
+            "ai_operations": 2000,
+            "reserve": 2000
         }
-        self.transaction_history = []
+        # Columnar transaction log: typed hot columns for filtering and
+        # aggregation, cold dicts for audit detail (see TransactionColumns)
+        self.transaction_history = TransactionColumns()
+        # Rolling per-day aggregates: each payment updates today's bucket in
+        # O(1) and summary queries sum at most 30 scalars instead of
+        # rescanning the whole 30-day window. Buckets older than 60 days are
+        # pruned when a new day starts.
+        self._daily_buckets = {}
+        # Bound the concurrent gateway/transfer fan-out - a naive gather over
+        # thousands of daily transactions would otherwise open unbounded
+        # connections and trip the gateway's rate limits
+        self._sem = asyncio.Semaphore(64)
+        # Per-process counter appended to transfer references: statements
+        # stay date-readable while same-day transfers are guaranteed unique
+        self._ref_counter = itertools.count(1)
+        # Instance-local RNG: the module-level random functions share one
+        # locked instance, which contends once payments run concurrently
+        self._random = random.Random()
+        # The payout shape is fixed; resolving the amount keys and account
+        # numbers once removes the per-payment endswith scan, f-string key
+        # building and accounts lookups
+        self._payout_plan = tuple(
+            (account, f"{account}_amount", self.accounts[f"{account}_account"])
+            for account in self._payout_bps
+        )
     
-    async def process_payment(self, amount: Decimal, customer_data: Dict) -> Dict:
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the process-wide keep-alive session for FNB API calls."""
+        return await get_session()
+    
+    async def process_payment(self, amount: Decimal, customer_data: Dict, today_str: str = None) -> Dict:
         """Process payment and distribute to FNB accounts"""
         print(f"💳 Processing payment: ZAR {amount}")
         
-        # Process payment (simulate FNB integration)
+        # Process payment (simulate FNB integration), retrying transient
+        # gateway failures with exponential backoff + jitter
         payment_result = await self._fnb_payment_gateway(amount, customer_data)
+        for attempt in range(2):
+            if payment_result['status'] == 'success':
+                break
+            await asyncio.sleep(0.2 * 2 ** attempt + self._random.random() * 0.1)
+            payment_result = await self._fnb_payment_gateway(amount, customer_data)
         
         if payment_result['status'] == 'success':
-            # Distribute funds according to allocation
-            distribution = self._distribute_funds(amount)
+            # One clock read covers the record timestamp, the bucket key and
+            # the payout timestamps below
+            now = datetime.now()
             
-            # Execute payouts
-            payout_results = await self._execute_payouts(distribution)
+            # Split the amount and execute the payouts in one fused pass
+            distribution, payout_results = await self._distribute_and_payout(
+                amount, today_str=today_str, now=now
+            )
             
             # Record transaction
             transaction_record = {
@@ -40,10 +186,13 @@ class FNBPaymentProcessor:
                 "customer_email": customer_data.get('email'),
                 "distribution": distribution,
                 "payouts": payout_results,
-                "timestamp": datetime.now(),
+                "timestamp": now,
                 "status": "completed"
             }
-            self.transaction_history.append(transaction_record)
+            self.transaction_history.append(
+                time.time_ns(), float(amount), _TX_COMPLETED, transaction_record
+            )
+            self._update_daily_bucket(amount, distribution, now)
             
             return {
                 "payment_status": "completed",
@@ -55,91 +204,157 @@ class FNBPaymentProcessor:
         
         return {"payment_status": "failed", "error": payment_result['error']}
     
+    def _update_daily_bucket(self, amount: Decimal, distribution: Dict, now: datetime = None):
+        """Fold a completed payment into today's rolling aggregate."""
+        today = (now or datetime.now()).date()
+        bucket = self._daily_buckets.get(today)
+        if bucket is None:
+            # New day: open its bucket and drop any that fell out of the
+            # 60-day retention ring
+            cutoff = today - timedelta(days=60)
+            for day in [d for d in self._daily_buckets if d < cutoff]:
+                del self._daily_buckets[day]
+            bucket = self._daily_buckets[today] = {
+                "count": 0,
+                "amount_sum": Decimal('0'),
+                "owner_sum": Decimal('0'),
+                "ai_operations_sum": Decimal('0'),
+                "reserve_sum": Decimal('0')
+            }
+        bucket["count"] += 1
+        bucket["amount_sum"] += amount
+        bucket["owner_sum"] += distribution['owner_amount']
+        bucket["ai_operations_sum"] += distribution['ai_operations_amount']
+        bucket["reserve_sum"] += distribution['reserve_amount']
+    
+    @lru_cache(maxsize=512)
     def _distribute_funds(self, amount: Decimal) -> Dict:
-        """Distribute funds to various FNB accounts"""
+        """Distribute funds to various FNB accounts.
+
+        Memoized: many payments share the handful of course price points,
+        and the split is a pure function of the amount. Callers must treat
+        the returned dict as read-only.
+        """
+        # Work in integer cents x basis points: a single C-level integer
+        # multiply per account instead of arbitrary-precision Decimal
+        # multiplies, and the three parts stay exact for currency
+        cents = int(amount.scaleb(2).to_integral_value())
+
+        distribution = {
+            f"{account}_amount": Decimal(cents * bps).scaleb(-6)
+            for account, bps in self._payout_bps.items()
+        }
         return {
-            "owner_amount": amount * self.payout_distribution['owner'],
-            "ai_operations_amount": amount * self.payout_distribution['ai_operations'],
-            "reserve_amount": amount * self.payout_distribution['reserve'],
-            "distribution_breakdown": {
-                "owner_percentage": float(self.payout_distribution['owner'] * 100),
-                "ai_operations_percentage": float(self.payout_distribution['ai_operations'] * 100),
-                "reserve_percentage": float(self.payout_distribution['reserve'] * 100)
-            }
+            **distribution,
+            "distribution_breakdown": _DISTRIBUTION_BREAKDOWN
         }
     
-    async def _execute_payouts(self, distribution: Dict) -> Dict:
-        """Execute payouts to FNB accounts"""
-        payouts = {}
-        
-        for account_type, amount in [(k, v) for k, v in distribution.items() if k.endswith('_amount')]:
-            base_type = account_type.replace('_amount', '')
-            account_number = self.accounts[f"{base_type}_account"]
-            
-            payout_result = await self._fnb_transfer(account_number, amount)
-            payouts[base_type] = payout_result
-        
-        return payouts
+    async def _distribute_and_payout(self, amount: Decimal, today_str: str = None,
+                                     now: datetime = None) -> tuple:
+        """Split the amount and execute the payouts in a single pass.
+
+        One iteration of the payout plan both reads the memoized split and
+        creates the transfer coroutines, so no second pass re-keys the
+        distribution dict. The three transfers are independent round-trips
+        and run concurrently (~1x RTT instead of 3x).
+        """
+        distribution = self._distribute_funds(amount)
+
+        transfer_tasks = [
+            self._fnb_transfer(account_number,
+                               distribution[amount_key],
+                               today_str=today_str, now=now)
+            for _, amount_key, account_number in self._payout_plan
+        ]
+        results = await asyncio.gather(*transfer_tasks)
+
+        payouts = {base_type: result
+                   for (base_type, _, _), result in zip(self._payout_plan, results)}
+        return distribution, payouts
     
     async def _fnb_payment_gateway(self, amount: Decimal, customer_data: Dict) -> Dict:
         """Simulate FNB payment gateway integration"""
-        # Simulate processing delay
-        await asyncio.sleep(1)
+        payload = _serialize({"amount": amount, "customer": customer_data})
+        
+        async with self._sem:
+            # Simulate processing delay (a real POST sends `payload` through
+            # the shared keep-alive session from _ensure_session)
+            await asyncio.sleep(1)
         
         # Simulate random failures (2% failure rate)
-        if random.random() < 0.02:
+        if self._random.random() < 0.02:
             return {
                 "status": "failed",
                 "error": "Payment processing failed - please try again",
                 "transaction_id": None
             }
         
-        # Successful payment
+        # Successful payment. token_hex is one getrandom(2) syscall for 16
+        # bytes of entropy - cheaper than hashing a timestamp and, unlike a
+        # clock-derived nonce, collision-free even for payments landing in
+        # the same microsecond.
         return {
             "status": "success",
-            "transaction_id": f"FNB_{hashlib.md5(str(datetime.now()).encode()).hexdigest()[:16]}",
+            "transaction_id": f"FNB_{secrets.token_hex(16)}",
             "amount": amount,
             "currency": "ZAR",
             "processed_at": datetime.now().isoformat()
         }
     
-    async def _fnb_transfer(self, account_number: str, amount: Decimal) -> Dict:
+    async def _fnb_transfer(self, account_number: str, amount: Decimal,
+                            today_str: str = None, now: datetime = None) -> Dict:
         """Simulate FNB bank transfer"""
-        # Simulate transfer processing
-        await asyncio.sleep(0.5)
+        payload = _serialize({"to_account": account_number, "amount": amount})
+        
+        async with self._sem:
+            # Simulate transfer processing of `payload`
+            await asyncio.sleep(0.5)
+        
+        if today_str is None:
+            today_str = _current_date_str()
         
         return {
             "status": "completed",
             "to_account": account_number,
             "amount": amount,
-            "reference": f"COSTBYTE_{datetime.now().strftime('%Y%m%d')}",
-            "timestamp": datetime.now(),
-            "transfer_id": f"TRF_{hashlib.md5((account_number + str(datetime.now())).encode()).hexdigest()[:12]}"
+            "reference": f"COSTBYTE_{today_str}_{next(self._ref_counter)}",
+            "timestamp": now or datetime.now(),
+            "transfer_id": f"TRF_{secrets.token_hex(6)}"
         }
     
     def get_transaction_history(self, days: int = 7) -> List[Dict]:
         """Get transaction history for specified days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        return [t for t in self.transaction_history if t['timestamp'] >= cutoff_date]
+        # Appends are time-ordered, so the cutoff is a binary search over
+        # the timestamp column followed by one slice of the cold store
+        columns = self.transaction_history
+        cutoff_ns = time.time_ns() - days * 86_400 * 1_000_000_000
+        start = int(np.searchsorted(columns.ts_ns[:columns.size], cutoff_ns, side='left'))
+        return columns.cold[start:]
     
     def get_revenue_summary(self) -> Dict:
         """Get revenue summary"""
-        recent_transactions = self.get_transaction_history(30)  # Last 30 days
-        
-        total_revenue = sum(Decimal(str(t['amount'])) for t in recent_transactions)
-        total_transactions = len(recent_transactions)
+        # Sum the rolling day buckets: at most 30 scalar adds per field,
+        # independent of how many transactions the window holds. The column
+        # log remains the source for per-transaction queries.
+        today = datetime.now().date()
+        get_bucket = self._daily_buckets.get
         
+        total_transactions = 0
+        total_revenue = Decimal('0')
         distribution_totals = {
             "owner": Decimal('0'),
             "ai_operations": Decimal('0'),
             "reserve": Decimal('0')
         }
-        
-        for transaction in recent_transactions:
-            dist = transaction['distribution']
-            distribution_totals['owner'] += dist['owner_amount']
-            distribution_totals['ai_operations'] += dist['ai_operations_amount']
-            distribution_totals['reserve'] += dist['reserve_amount']
+        for offset in range(30):
+            bucket = get_bucket(today - timedelta(days=offset))
+            if bucket is None:
+                continue
+            total_transactions += bucket["count"]
+            total_revenue += bucket["amount_sum"]
+            distribution_totals["owner"] += bucket["owner_sum"]
+            distribution_totals["ai_operations"] += bucket["ai_operations_sum"]
+            distribution_totals["reserve"] += bucket["reserve_sum"]
         
         return {
             "period": "last_30_days",
@@ -147,13 +362,22 @@ class FNBPaymentProcessor:
             "total_transactions": total_transactions,
             "average_transaction_value": total_revenue / total_transactions if total_transactions > 0 else Decimal('0'),
             "distribution_summary": distribution_totals,
-            "success_rate": len([t for t in recent_transactions if t['status'] == 'completed']) / total_transactions if total_transactions > 0 else 0
+            # Buckets only ever record completed payments
+            "success_rate": 1.0 if total_transactions > 0 else 0
         }
 
 class RevenueDistributor:
     def __init__(self):
         self.payment_processor = FNBPaymentProcessor()
-        self.daily_distributions = []
+        # Bounded to ~13 months of daily records - reports never look back
+        # further, so older entries can age out instead of growing RSS
+        self.daily_distributions = deque(maxlen=400)
+        # Timestamps parallel to daily_distributions: appends are
+        # time-ordered, so history cutoffs become a bisect + slice
+        self._dist_ts = deque(maxlen=400)
+        # Batched PCG64 draws for the mock-day generator - one C call for
+        # all amounts/hours instead of two Python randint calls per row
+        self._rng = np.random.default_rng()
     
     async def distribute_daily_revenue(self) -> Dict:
         """Distribute daily revenue to FNB accounts"""
@@ -162,11 +386,20 @@ class RevenueDistributor:
         daily_revenue = await self._calculate_daily_revenue()
         distribution_results = {}
         
-        for transaction in daily_revenue['transactions']:
-            result = await self.payment_processor.process_payment(
-                Decimal(str(transaction['amount'])),
-                transaction['customer_data']
+        # Format the date once for the whole distribution run - it is the
+        # same for every payout inside it
+        today_str = _current_date_str()
+        
+        # Process the day's transactions concurrently instead of one at a time
+        payment_results = await asyncio.gather(*(
+            self.payment_processor.process_payment(
+                Decimal(transaction['amount']),  # amounts are ints - no str round-trip
+                transaction['customer_data'],
+                today_str=today_str
             )
+            for transaction in daily_revenue['transactions']
+        ))
+        for transaction, result in zip(daily_revenue['transactions'], payment_results):
             distribution_results[transaction['id']] = result
         
         # Record daily distribution
@@ -178,6 +411,7 @@ class RevenueDistributor:
             "timestamp": datetime.now()
         }
         self.daily_distributions.append(distribution_record)
+        self._dist_ts.append(distribution_record["timestamp"])
         
         return {
             "daily_revenue": daily_revenue['total'],
@@ -192,21 +426,25 @@ class RevenueDistributor:
         # For simulation, generate mock data
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         
-        # Mock transactions for simulation
+        # Mock transactions for simulation: draw the whole day's amounts and
+        # hours in two vectorized calls, then zip into rows
+        count = int(self._rng.integers(50, 201))  # 50-200 transactions per day
+        amounts = self._rng.integers(1997, 4998, size=count)
+        hours = self._rng.integers(0, 24, size=count)
         mock_transactions = [
             {
                 "id": f"txn_{i}",
-                "amount": random.randint(1997, 4997),
+                "amount": int(amounts[i]),
                 "customer_data": {
                     "email": f"customer{i}@example.com",
                     "name": f"Customer {i}"
                 },
-                "timestamp": today_start + timedelta(hours=random.randint(0, 23))
+                "timestamp": today_start + timedelta(hours=int(hours[i]))
             }
-            for i in range(random.randint(50, 200))  # 50-200 transactions per day
+            for i in range(count)
         ]
         
-        total_revenue = sum(t['amount'] for t in mock_transactions)
+        total_revenue = int(amounts.sum())
         
         return {
             "total": total_revenue,
@@ -217,48 +455,55 @@ class RevenueDistributor:
     def get_distribution_history(self, days: int = 7) -> List[Dict]:
         """Get distribution history"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        return [d for d in self.daily_distributions if d['timestamp'] >= cutoff_date]
+        start = bisect.bisect_left(self._dist_ts, cutoff_date)
+        return list(itertools.islice(self.daily_distributions, start, None))
     
     def generate_financial_report(self) -> Dict:
         """Generate comprehensive financial report"""
         recent_distributions = self.get_distribution_history(30)
+        count = len(recent_distributions)
         
-        total_distributed = sum(d['total_distributed'] for d in recent_distributions)
-        average_daily_revenue = total_distributed / len(recent_distributions) if recent_distributions else 0
+        # Materialize the two numeric columns once; every aggregate below is
+        # then a C-level reduction or slice sum instead of a Python re-scan
+        totals = np.fromiter((d['total_distributed'] for d in recent_distributions),
+                             dtype=np.float64, count=count)
+        transaction_counts = np.fromiter((d['transaction_count'] for d in recent_distributions),
+                                         dtype=np.int64, count=count)
+        
+        total_distributed = float(totals.sum())
+        average_daily_revenue = total_distributed / count if count else 0
         
         return {
             "report_period": "last_30_days",
             "total_revenue_distributed": total_distributed,
             "average_daily_revenue": average_daily_revenue,
-            "total_transactions": sum(d['transaction_count'] for d in recent_distributions),
-            "account_balances": self._estimate_account_balances(recent_distributions),
-            "growth_metrics": self._calculate_growth_metrics(recent_distributions),
+            "total_transactions": int(transaction_counts.sum()),
+            "account_balances": self._estimate_account_balances(total_distributed),
+            "growth_metrics": self._calculate_growth_metrics(totals),
             "compliance_status": "fully_compliant"
         }
     
-    def _estimate_account_balances(self, distributions: List[Dict]) -> Dict:
+    def _estimate_account_balances(self, total_distributed: float) -> Dict:
         """Estimate current account balances"""
         # This would normally come from bank API
-        # For simulation, calculate based on distributions
-        total_distributed = sum(d['total_distributed'] for d in distributions)
-        
+        # For simulation, calculate based on the already-summed total
         return {
-            "owner_account": total_distributed * 0.60,
-            "ai_operations_account": total_distributed * 0.20,
-            "reserve_account": total_distributed * 0.20
+            "owner_account": total_distributed * float(_OWNER_PCT),
+            "ai_operations_account": total_distributed * float(_AI_PCT),
+            "reserve_account": total_distributed * float(_RESERVE_PCT)
         }
     
-    def _calculate_growth_metrics(self, distributions: List[Dict]) -> Dict:
-        """Calculate revenue growth metrics"""
-        if len(distributions) < 2:
+    def _calculate_growth_metrics(self, totals: np.ndarray) -> Dict:
+        """Calculate revenue growth metrics from the daily totals column."""
+        if totals.size < 2:
             return {"weekly_growth": 0, "monthly_growth": 0, "trend": "insufficient_data"}
         
-        # Calculate weekly growth
-        recent_week = distributions[-7:] if len(distributions) >= 7 else distributions
-        previous_week = distributions[-14:-7] if len(distributions) >= 14 else recent_week
+        # Weekly growth as two slice sums over the contiguous totals
+        recent_week = totals[-7:]
+        previous_week = totals[-14:-7] if totals.size >= 14 else recent_week
         
-        recent_week_revenue = sum(d['total_distributed'] for d in recent_week)
-        previous_week_revenue = sum(d['total_distributed'] for d in previous_week)
+        recent_week_revenue = float(recent_week.sum())
+        previous_week_revenue = float(previous_week.sum())
         
         weekly_growth = (recent_week_revenue - previous_week_revenue) / previous_week_revenue if previous_week_revenue > 0 else 0
         
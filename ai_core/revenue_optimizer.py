@@ -1,14 +1,24 @@
 # ai_core/revenue_optimizer.py
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-import random
 from decimal import Decimal
+import numpy as np
+
+# Bounds for the simulated impact draws, in the order the result keys are
+# built below; one batched uniform call replaces four scalar draws
+_IMPACT_LOW = (0.15, 0.20, 0.03, 0.01)
+_IMPACT_HIGH = (0.40, 0.50, 0.08, 0.03)
 
 class RevenueOptimizer:
     def __init__(self):
         self.optimization_strategies = self._load_optimization_strategies()
         self.performance_metrics = {}
         self.optimization_history = []
+        # Running aggregates updated on every optimization so the
+        # performance readout is O(1) instead of rescanning the history
+        self._success_count = 0
+        self._impact_sum = 0.0
+        self._rng = np.random.default_rng()
     
     def optimize_revenue_growth(self, current_metrics: Dict, targets: Dict) -> Dict:
         """Optimize revenue growth strategies based on current performance"""
@@ -28,6 +38,10 @@ class RevenueOptimizer:
         }
         
         self.optimization_history.append(optimization_plan)
+        impact = optimization_plan['expected_impact']['revenue_increase_percentage']
+        self._impact_sum += impact
+        if impact > 0.1:
+            self._success_count += 1
         return optimization_plan
     
     def _analyze_current_performance(self, metrics: Dict, targets: Dict) -> Dict:
@@ -193,11 +207,12 @@ class RevenueOptimizer:
     
     def _calculate_expected_impact(self, strategies: Dict) -> Dict:
         """Calculate expected impact of optimization strategies"""
+        draws = self._rng.uniform(_IMPACT_LOW, _IMPACT_HIGH)
         return {
-            "revenue_increase_percentage": random.uniform(0.15, 0.40),
-            "subscriber_growth_percentage": random.uniform(0.20, 0.50),
-            "conversion_rate_improvement": random.uniform(0.03, 0.08),
-            "churn_reduction": random.uniform(0.01, 0.03),
+            "revenue_increase_percentage": float(draws[0]),
+            "subscriber_growth_percentage": float(draws[1]),
+            "conversion_rate_improvement": float(draws[2]),
+            "churn_reduction": float(draws[3]),
             "time_to_impact": "30-90 days"
         }
     
@@ -223,15 +238,14 @@ class RevenueOptimizer:
         if not self.optimization_history:
             return {"message": "No optimization data available"}
         
-        successful_optimizations = sum(1 for opt in self.optimization_history 
-                                     if opt['expected_impact']['revenue_increase_percentage'] > 0.1)
-        
+        # Served from the running counters; only the recent slice touches
+        # the history list
+        total = len(self.optimization_history)
         return {
-            "total_optimizations": len(self.optimization_history),
-            "success_rate": successful_optimizations / len(self.optimization_history),
-            "average_revenue_impact": sum(opt['expected_impact']['revenue_increase_percentage'] 
-                                        for opt in self.optimization_history) / len(self.optimization_history),
-            "recent_optimizations": self.optimization_history[-3:] if len(self.optimization_history) >= 3 else self.optimization_history
+            "total_optimizations": total,
+            "success_rate": self._success_count / total,
+            "average_revenue_impact": self._impact_sum / total,
+            "recent_optimizations": self.optimization_history[-3:] if total >= 3 else self.optimization_history
         }
     
     def _load_optimization_strategies(self) -> Dict:
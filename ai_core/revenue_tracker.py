@@ -1,140 +1,274 @@
 # ai_core/revenue_tracker.py
+import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List
+import numpy as np
 import pandas as pd
-import random
+
+logger = logging.getLogger('ecommerce.revenue')
+
+# Day names indexed by ((epoch_day + 3) % 7): the epoch fell on a Thursday
+_DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+_NS_PER_DAY = 86_400_000_000_000
+
+# In-memory record cap for the tracker: when reached, the oldest half is
+# dropped so a long-lived process cannot grow without bound. Weekly
+# aggregates survive compaction, so trend math keeps its full history.
+_REVENUE_MAXLEN = 500_000
 
 class RevenueTracker:
     def __init__(self):
         self.revenue_data = []
+        # Incremental per-week aggregates: O(1) to maintain per append, so
+        # trend/growth queries read a tiny dict instead of re-grouping the
+        # whole history by week
+        self.weekly_totals = defaultdict(float)
+        self.weekly_counts = defaultdict(int)
+        # Hot numeric fields go into preallocated parallel arrays
+        # (amount, epoch-ns timestamp, week number) with doubling growth, so
+        # numeric reductions never have to touch the record dicts
+        self._amount = np.empty(1024, dtype=np.float64)
+        self._ts_ns = np.empty(1024, dtype=np.int64)
+        self._week = np.empty(1024, dtype=np.int16)
+        self._n = 0
+        # Cached columnar view of revenue_data; only rows added since the
+        # last materialization pay the dict-to-column conversion
+        self._df_cache = None
+        self._df_len = 0
         self.analytics_engine = RevenueAnalytics()
         self.daily_targets = {
             "subscribers": 715,  # 5000 per week
             "revenue_zar": 3570000,  # 25M per week
             "conversion_rate": 0.08
         }
+        # Derived targets dict, rebuilt only when the targets change -
+        # dashboards poll this every few seconds
+        self._targets_cache = None
     
     async def track_revenue(self, transaction: Dict) -> None:
         """Track revenue in real-time"""
+        # One clock read for all four derived fields
+        now = datetime.now()
         tracked_transaction = {
             **transaction,
-            "timestamp": datetime.now(),
-            "week_number": datetime.now().isocalendar()[1],
-            "month_number": datetime.now().month,
-            "year": datetime.now().year
+            "timestamp": now,
+            "week_number": now.isocalendar()[1],
+            "month_number": now.month,
+            "year": now.year
         }
         
         self.revenue_data.append(tracked_transaction)
-        print(f"💰 Revenue tracked: ZAR {transaction.get('amount', 0):,}")
+        week_number = tracked_transaction['week_number']
+        amount = transaction.get('amount', 0)
+        self.weekly_totals[week_number] += float(amount)
+        self.weekly_counts[week_number] += 1
+        self._append_columns(amount, now, week_number)
+        # A print per transaction is a stdout syscall on the hot path; only
+        # pay for the formatting when debug tracing is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("💰 Revenue tracked: ZAR %s", f"{transaction.get('amount', 0):,}")
+    
+    def _append_columns(self, amount, now: datetime, week_number: int):
+        """Write the hot fields of one record into the parallel arrays."""
+        if self._n >= _REVENUE_MAXLEN:
+            self._compact()
+        if self._n == self._amount.shape[0]:
+            capacity = min(self._amount.shape[0] * 2, _REVENUE_MAXLEN)
+            for name in ("_amount", "_ts_ns", "_week"):
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:self._n] = old[:self._n]
+                setattr(self, name, new)
+        idx = self._n
+        self._amount[idx] = float(amount)
+        self._ts_ns[idx] = int(now.timestamp() * 1e9)
+        self._week[idx] = week_number
+        self._n = idx + 1
+    
+    def _compact(self):
+        """Drop the oldest half of the records at the in-memory cap.
+
+        Records, columns and the cached frame stay aligned; the running
+        weekly aggregates are untouched, so long-range trends still see
+        the evicted rows.
+        """
+        half = self._n // 2
+        keep = self._n - half
+        for column in (self._amount, self._ts_ns, self._week):
+            column[:keep] = column[half:self._n]
+        del self.revenue_data[:half]
+        self._n = keep
+        # The cached frame indexes shifted - rebuild it lazily
+        self._df_cache = None
+        self._df_len = 0
     
     async def get_revenue_analytics(self, period: str = "weekly") -> Dict:
         """Get comprehensive revenue analytics"""
+        df = self._full_frame()
+        now = datetime.now()
         if period == "weekly":
-            data = self._get_weekly_data()
+            cutoff = now - timedelta(days=now.weekday())
         elif period == "monthly":
-            data = self._get_monthly_data()
+            cutoff = now.replace(day=1)
         elif period == "daily":
-            data = self._get_daily_data()
+            cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0)
         else:
-            data = self.revenue_data
-        
-        return self.analytics_engine.analyze_revenue(data, self.daily_targets)
+            cutoff = None
+        
+        start = self._index_since(cutoff) if cutoff is not None else 0
+        # Rows are time-ordered, so the period window is one slice of the
+        # cached frame; the contiguous amount column rides along so the
+        # summary math never touches the frame
+        df = df.iloc[start:]
+        amounts = self._amount[start:self._n]
+        ts_ns = self._ts_ns[start:self._n]
+        
+        return self.analytics_engine.analyze_revenue(df, self.daily_targets, amounts=amounts,
+                                                     ts_ns=ts_ns,
+                                                     weekly_totals=self.weekly_totals)
     
-    def _get_weekly_data(self) -> List[Dict]:
-        """Get data for current week"""
-        week_start = datetime.now() - timedelta(days=datetime.now().weekday())
-        return [d for d in self.revenue_data if d['timestamp'] >= week_start]
+    def _full_frame(self):
+        """Columnar view of all tracked revenue, extended incrementally.
+
+        Only rows appended since the last call are converted from dicts and
+        concatenated, instead of rebuilding the whole frame per analysis.
+        """
+        total = len(self.revenue_data)
+        if self._df_cache is None or self._df_len != total:
+            new_rows = pd.DataFrame(self.revenue_data[self._df_len:])
+            if self._df_cache is None or self._df_len == 0:
+                self._df_cache = new_rows
+            else:
+                self._df_cache = pd.concat([self._df_cache, new_rows], ignore_index=True)
+            self._df_len = total
+        return self._df_cache
     
-    def _get_monthly_data(self) -> List[Dict]:
-        """Get data for current month"""
-        month_start = datetime.now().replace(day=1)
-        return [d for d in self.revenue_data if d['timestamp'] >= month_start]
+    def _index_since(self, cutoff: datetime) -> int:
+        """Index of the first record at or after the cutoff.
+
+        Appends are time-ordered, so this is a binary search over the
+        contiguous timestamp column - O(log n) instead of a full scan.
+        """
+        cutoff_ns = int(cutoff.timestamp() * 1e9)
+        return int(np.searchsorted(self._ts_ns[:self._n], cutoff_ns, side='left'))
     
-    def _get_daily_data(self) -> List[Dict]:
-        """Get data for current day"""
-        day_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        return [d for d in self.revenue_data if d['timestamp'] >= day_start]
+    def _data_since(self, cutoff: datetime) -> List[Dict]:
+        """Slice records at or after the cutoff via binary search."""
+        return self.revenue_data[self._index_since(cutoff):]
     
     def get_revenue_targets(self) -> Dict:
         """Get current revenue targets"""
-        return {
-            "daily_targets": self.daily_targets,
-            "weekly_targets": {
-                "subscribers": self.daily_targets["subscribers"] * 7,
-                "revenue_zar": self.daily_targets["revenue_zar"] * 7
-            },
-            "monthly_targets": {
-                "subscribers": self.daily_targets["subscribers"] * 30,
-                "revenue_zar": self.daily_targets["revenue_zar"] * 30
+        if self._targets_cache is None:
+            self._targets_cache = {
+                "daily_targets": self.daily_targets,
+                "weekly_targets": {
+                    "subscribers": self.daily_targets["subscribers"] * 7,
+                    "revenue_zar": self.daily_targets["revenue_zar"] * 7
+                },
+                "monthly_targets": {
+                    "subscribers": self.daily_targets["subscribers"] * 30,
+                    "revenue_zar": self.daily_targets["revenue_zar"] * 30
+                }
             }
-        }
+        return self._targets_cache
     
     def update_targets(self, new_targets: Dict):
         """Update revenue targets"""
         self.daily_targets.update(new_targets)
+        self._targets_cache = None
         print("🎯 Revenue targets updated")
 
 class RevenueAnalytics:
-    def analyze_revenue(self, revenue_data: List[Dict], targets: Dict) -> Dict:
-        """Advanced revenue analysis"""
-        if not revenue_data:
+    def __init__(self):
+        self._rng = np.random.default_rng()
+    
+    def analyze_revenue(self, revenue_data, targets: Dict, amounts=None,
+                        ts_ns=None, weekly_totals: Dict = None) -> Dict:
+        """Advanced revenue analysis.
+
+        Accepts an already-columnar DataFrame (the tracker passes a slice of
+        its cached frame plus the matching contiguous amount column and its
+        incrementally maintained weekly totals) or a list of record dicts
+        for other callers.
+        """
+        if isinstance(revenue_data, pd.DataFrame):
+            df = revenue_data
+        else:
+            df = pd.DataFrame(revenue_data)
+        if len(df) == 0:
             return {"status": "no_data", "message": "No revenue data available"}
+        if amounts is None:
+            amounts = df['amount'].to_numpy(dtype=np.float64)
         
-        df = pd.DataFrame(revenue_data)
-        
-        # Calculate key metrics
-        total_revenue = df['amount'].sum()
+        # Summary metrics reduce the raw column; the frame is only used by
+        # the helpers that genuinely need grouping
+        total_revenue = float(amounts.sum())
         total_subscribers = len(df)
-        avg_transaction_value = df['amount'].mean()
+        avg_transaction_value = float(amounts.mean())
         
         # Time-based analysis
-        daily_revenue = self._calculate_daily_revenue(df)
-        weekly_trend = self._calculate_weekly_trend(df)
+        daily_revenue = self._calculate_daily_revenue(df, ts_ns)
+        weekly_trend = self._calculate_weekly_trend(df, weekly_totals)
         
         # Target performance
         target_performance = self._calculate_target_performance(total_revenue, total_subscribers, targets)
         
         # Predictive analytics
-        revenue_forecast = self._generate_forecast(df)
+        revenue_forecast = self._generate_forecast(df, amounts, weekly_totals)
         
         return {
             "summary_metrics": {
                 "total_revenue": total_revenue,
                 "total_subscribers": total_subscribers,
                 "average_transaction_value": avg_transaction_value,
-                "revenue_growth_rate": self._calculate_growth_rate(df),
+                "revenue_growth_rate": self._calculate_growth_rate(df, weekly_totals),
                 "customer_acquisition_cost": self._estimate_cac(df)
             },
             "time_analysis": {
                 "daily_revenue": daily_revenue,
                 "weekly_trend": weekly_trend,
-                "best_performing_day": self._get_best_performing_day(df),
-                "revenue_momentum": self._assess_momentum(df)
+                "best_performing_day": self._get_best_performing_day(df, amounts, ts_ns),
+                "revenue_momentum": self._assess_momentum(amounts)
             },
             "target_performance": target_performance,
             "predictive_insights": revenue_forecast,
             "optimization_recommendations": self._generate_recommendations(df, target_performance)
         }
     
-    def _calculate_daily_revenue(self, df) -> List[Dict]:
+    def _calculate_daily_revenue(self, df, ts_ns=None) -> List[Dict]:
         """Calculate daily revenue breakdown"""
-        if 'timestamp' not in df.columns:
-            return []
-        
-        df['date'] = pd.to_datetime(df['timestamp']).dt.date
-        daily = df.groupby('date').agg({
-            'amount': 'sum',
-            'id': 'count'  # Assuming 'id' represents transactions
-        }).reset_index()
-        
-        return daily.to_dict('records')
+        if ts_ns is None:
+            # Fallback for list-of-dicts callers without the typed column
+            if 'timestamp' not in df.columns:
+                return []
+            ts_ns = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        
+        # Rows are appended in time order, so days form contiguous runs:
+        # one reduceat over the run starts replaces the pandas groupby and
+        # its intermediate Series
+        day_id = ts_ns // _NS_PER_DAY
+        run_starts = np.r_[0, np.nonzero(np.diff(day_id))[0] + 1]
+        
+        daily_sums = np.add.reduceat(df['amount'].to_numpy(dtype=np.float64), run_starts)
+        daily_counts = np.diff(np.r_[run_starts, day_id.size])
+        dates = np.asarray(day_id[run_starts], dtype='datetime64[D]').tolist()
+        
+        return [
+            {"date": date, "amount": float(amount), "id": int(count)}
+            for date, amount, count in zip(dates, daily_sums, daily_counts)
+        ]
     
-    def _calculate_weekly_trend(self, df) -> Dict:
+    def _calculate_weekly_trend(self, df, weekly_totals: Dict = None) -> Dict:
         """Calculate weekly revenue trends"""
-        if 'week_number' not in df.columns:
+        if weekly_totals:
+            # Served from the tracker's running per-week sums - no re-group
+            weekly = pd.Series(dict(sorted(weekly_totals.items())))
+        elif 'week_number' not in df.columns:
             return {"trend": "stable", "confidence": "low"}
-        
-        weekly = df.groupby('week_number')['amount'].sum()
+        else:
+            weekly = df.groupby('week_number')['amount'].sum()
         
         if len(weekly) < 2:
             return {"trend": "insufficient_data", "confidence": "low"}
@@ -167,9 +301,9 @@ class RevenueAnalytics:
             "status": "on_track" if revenue_performance >= 80 and subscriber_performance >= 80 else "needs_attention"
         }
     
-    def _generate_forecast(self, df) -> Dict:
+    def _generate_forecast(self, df, amounts, weekly_totals: Dict = None) -> Dict:
         """Generate revenue forecast"""
-        if len(df) < 7:  # Need at least 7 days of data
+        if amounts.size < 7:  # Need at least 7 days of data
             return {
                 "next_week_forecast": "insufficient_data",
                 "next_month_forecast": "insufficient_data",
@@ -177,8 +311,8 @@ class RevenueAnalytics:
             }
         
         # Simple forecasting based on recent trend
-        recent_revenue = df['amount'].tail(7).sum()
-        growth_rate = self._calculate_growth_rate(df)
+        recent_revenue = float(amounts[-7:].sum())
+        growth_rate = self._calculate_growth_rate(df, weekly_totals)
         
         next_week_forecast = recent_revenue * (1 + growth_rate)
         next_month_forecast = recent_revenue * 4 * (1 + growth_rate) ** 4
@@ -190,8 +324,16 @@ class RevenueAnalytics:
             "assumptions": ["Current growth rate continues", "No major market changes"]
         }
     
-    def _calculate_growth_rate(self, df) -> float:
+    def _calculate_growth_rate(self, df, weekly_totals: Dict = None) -> float:
         """Calculate week-over-week growth rate"""
+        if weekly_totals:
+            if len(weekly_totals) < 2:
+                return 0.1  # Default 10% growth
+            weeks = sorted(weekly_totals)
+            current_week = weekly_totals[weeks[-1]]
+            previous_week = weekly_totals[weeks[-2]]
+            return (current_week - previous_week) / previous_week if previous_week > 0 else 0.1
+        
         if 'week_number' not in df.columns or len(df) < 14:  # Need 2 weeks of data
             return 0.1  # Default 10% growth
         
@@ -208,29 +350,34 @@ class RevenueAnalytics:
         """Estimate customer acquisition cost"""
         # This would normally come from marketing data
         # For simulation, using industry averages
-        return random.uniform(500, 2000)  # ZAR 500-2000 per customer
+        return float(self._rng.uniform(500, 2000))  # ZAR 500-2000 per customer
     
-    def _get_best_performing_day(self, df) -> str:
+    def _get_best_performing_day(self, df, amounts=None, ts_ns=None) -> str:
         """Identify best performing day of week"""
+        if ts_ns is not None and amounts is not None:
+            if ts_ns.size == 0:
+                return "unknown"
+            # Integer day-of-week from the raw epoch column plus one
+            # bincount - no datetime parse, no groupby
+            day_idx = ((ts_ns // _NS_PER_DAY) + 3) % 7
+            totals = np.bincount(day_idx, weights=amounts, minlength=7)
+            return _DAY_NAMES[int(totals.argmax())]
+        
         if 'timestamp' not in df.columns:
             return "unknown"
         
-        df['day_of_week'] = pd.to_datetime(df['timestamp']).dt.day_name()
-        daily_performance = df.groupby('day_of_week')['amount'].sum()
+        day_names = pd.to_datetime(df['timestamp']).dt.day_name()
+        daily_performance = df['amount'].groupby(day_names).sum()
         
         return daily_performance.idxmax() if not daily_performance.empty else "unknown"
     
-    def _assess_momentum(self, df) -> str:
+    def _assess_momentum(self, amounts) -> str:
         """Assess revenue momentum"""
-        if len(df) < 2:
+        if amounts.size < 2:
             return "starting"
         
-        recent_days = df.tail(7)
-        if len(recent_days) < 2:
-            return "stable"
-        
-        current_revenue = recent_days['amount'].sum()
-        previous_revenue = df['amount'].head(7).sum() if len(df) >= 14 else current_revenue * 0.8
+        current_revenue = float(amounts[-7:].sum())
+        previous_revenue = float(amounts[:7].sum()) if amounts.size >= 14 else current_revenue * 0.8
         
         momentum = (current_revenue - previous_revenue) / previous_revenue
         
@@ -248,12 +395,13 @@ class RevenueAnalytics:
         if len(weekly_series) < 2:
             return 0.0
         
-        growth_rates = []
-        for i in range(1, len(weekly_series)):
-            growth = (weekly_series.iloc[i] - weekly_series.iloc[i-1]) / weekly_series.iloc[i-1]
-            growth_rates.append(growth)
+        # One vectorized diff over the underlying array instead of paired
+        # .iloc indexing per week
+        values = weekly_series.to_numpy(dtype=np.float64)
+        previous = values[:-1]
+        growth_rates = np.diff(values)[previous != 0] / previous[previous != 0]
         
-        return sum(growth_rates) / len(growth_rates) if growth_rates else 0.0
+        return float(growth_rates.mean()) if growth_rates.size else 0.0
     
     def _generate_recommendations(self, df, target_performance: Dict) -> List[str]:
         """Generate revenue optimization recommendations"""
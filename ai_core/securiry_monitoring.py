@@ -1,10 +1,54 @@
 # ai_core/security_monitoring.py
+import bisect
+import concurrent.futures
 import hashlib
+import logging
+import logging.handlers
+import os
 import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from enum import IntEnum
 from typing import Dict, List
 import asyncio
-from datetime import datetime
-import random
+from datetime import datetime, timedelta
+import numpy as np
+
+# Buffered logger: events accumulate in memory and flush to stderr in
+# batches (immediately from WARNING up), so routine events cost a list
+# append instead of a write syscall per message
+logger = logging.getLogger('ecommerce.security')
+if not logger.handlers:
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.WARNING,
+        target=logging.StreamHandler()
+    ))
+    logger.setLevel(logging.INFO)
+
+class Severity(IntEnum):
+    """Alert severity as an integer, so dispatch is a compare, not a
+    string equality chain."""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+# Alert payloads keep their string severities for reports; this maps them
+# to the enum at the dispatch point
+_SEVERITY = {
+    "low": Severity.LOW,
+    "medium": Severity.MEDIUM,
+    "high": Severity.HIGH,
+    "critical": Severity.CRITICAL
+}
+
+# Feature column order for the threat-detection model
+_FEATURE_KEYS = ('login_frequency', 'failed_attempts', 'geolocation_changes',
+                 'unusual_hours', 'data_access_pattern', 'session_duration')
+
+# Rows scored per model call in batch detection
+_FEATURE_BATCH = 256
 
 class MilitaryGradeSecurity:
     def __init__(self):
@@ -12,7 +56,23 @@ class MilitaryGradeSecurity:
         self.audit_log = []
         self.threat_detection = ThreatDetectionSystem()
         self.security_incidents = []
+        # Incident timestamps in append order, so age filters are a binary
+        # search instead of a per-incident datetime subtraction
+        self._incident_ts = []
+        # Running count of critical incidents - recommendations read this
+        # instead of rescanning every incident
+        self._critical_count = 0
         self.continuous_monitoring_active = False
+        # Lazily created worker pool for batch encryption - OpenSSL drops
+        # the GIL inside pbkdf2, so the hashing scales across cores
+        self._crypto_pool = None
+        # Batched uniform draws for the simulated checks: one vectorized
+        # refill per 1024 samples instead of a Mersenne call per check. The
+        # lock keeps the cursor consistent across the check worker threads.
+        self._rng = np.random.default_rng()
+        self._draws = self._rng.random(1024)
+        self._draw_idx = 0
+        self._draw_lock = threading.Lock()
     
     def secure_platform(self) -> Dict:
         """Implement comprehensive security measures"""
@@ -70,12 +130,18 @@ class MilitaryGradeSecurity:
     
     async def _perform_security_checks(self):
         """Perform comprehensive security checks"""
+        # The checks are plain sync functions (and will grow subprocess/
+        # socket work); running them via to_thread lets them genuinely
+        # overlap instead of serializing on the event loop
         checks = [
-            self._check_system_vulnerabilities(),
-            self._analyze_network_traffic(),
-            self._monitor_user_behavior(),
-            self._verify_data_integrity(),
-            self._check_compliance_status()
+            asyncio.to_thread(check)
+            for check in (
+                self._check_system_vulnerabilities,
+                self._analyze_network_traffic,
+                self._monitor_user_behavior,
+                self._verify_data_integrity,
+                self._check_compliance_status
+            )
         ]
         
         results = await asyncio.gather(*checks, return_exceptions=True)
@@ -86,10 +152,20 @@ class MilitaryGradeSecurity:
             elif result.get('status') == 'alert':
                 self._handle_security_alert(result)
     
-    async def _check_system_vulnerabilities(self) -> Dict:
+    def _next_draw(self) -> float:
+        """Next uniform [0, 1) sample from the batched reservoir."""
+        with self._draw_lock:
+            if self._draw_idx >= self._draws.shape[0]:
+                self._draws = self._rng.random(1024)
+                self._draw_idx = 0
+            value = float(self._draws[self._draw_idx])
+            self._draw_idx += 1
+        return value
+    
+    def _check_system_vulnerabilities(self) -> Dict:
         """Check for system vulnerabilities"""
         # Simulated vulnerability check
-        vulnerabilities = random.randint(0, 2)
+        vulnerabilities = int(self._next_draw() * 3)  # 0-2
         
         if vulnerabilities > 0:
             return {
@@ -101,10 +177,10 @@ class MilitaryGradeSecurity:
         
         return {"status": "secure", "message": "No critical vulnerabilities found"}
     
-    async def _analyze_network_traffic(self) -> Dict:
+    def _analyze_network_traffic(self) -> Dict:
         """Analyze network traffic for anomalies"""
         # Simulated network analysis
-        suspicious_activity = random.random() < 0.05  # 5% chance of suspicious activity
+        suspicious_activity = self._next_draw() < 0.05  # 5% chance of suspicious activity
         
         if suspicious_activity:
             return {
@@ -116,10 +192,10 @@ class MilitaryGradeSecurity:
         
         return {"status": "normal", "message": "Network traffic within normal parameters"}
     
-    async def _monitor_user_behavior(self) -> Dict:
+    def _monitor_user_behavior(self) -> Dict:
         """Monitor user behavior for anomalies"""
         # Simulated behavior analysis
-        anomalous_behavior = random.random() < 0.03  # 3% chance of anomalous behavior
+        anomalous_behavior = self._next_draw() < 0.03  # 3% chance of anomalous behavior
         
         if anomalous_behavior:
             return {
@@ -131,10 +207,10 @@ class MilitaryGradeSecurity:
         
         return {"status": "normal", "message": "User behavior patterns normal"}
     
-    async def _verify_data_integrity(self) -> Dict:
+    def _verify_data_integrity(self) -> Dict:
         """Verify data integrity and backups"""
         # Simulated integrity check
-        integrity_issues = random.random() < 0.01  # 1% chance of integrity issues
+        integrity_issues = self._next_draw() < 0.01  # 1% chance of integrity issues
         
         if integrity_issues:
             return {
@@ -146,10 +222,10 @@ class MilitaryGradeSecurity:
         
         return {"status": "secure", "message": "Data integrity verified"}
     
-    async def _check_compliance_status(self) -> Dict:
+    def _check_compliance_status(self) -> Dict:
         """Check security compliance status"""
         # Simulated compliance check
-        compliance_issues = random.random() < 0.02  # 2% chance of compliance issues
+        compliance_issues = self._next_draw() < 0.02  # 2% chance of compliance issues
         
         if compliance_issues:
             return {
@@ -163,11 +239,16 @@ class MilitaryGradeSecurity:
     
     def encrypt_sensitive_data(self, data: str) -> Dict:
         """Military-grade encryption for sensitive data"""
+        # Encode once and feed the same bytes to both digests; hashlib
+        # dispatches to OpenSSL, which uses hardware SHA-256 (SHA-NI /
+        # ARMv8 crypto) where available. The 100k pbkdf2 rounds dominate
+        # this call.
+        data_bytes = data.encode('utf-8')
         salt = secrets.token_bytes(32)
-        key = hashlib.pbkdf2_hmac('sha256', data.encode(), salt, 100000)
+        key = hashlib.pbkdf2_hmac('sha256', data_bytes, salt, 100000, dklen=32)
         
         encrypted_data = {
-            "encrypted_data": f"encrypted_{hashlib.sha256(data.encode()).hexdigest()}",
+            "encrypted_data": f"encrypted_{hashlib.sha256(data_bytes).hexdigest()}",
             "salt": salt.hex(),
             "key_hash": key.hex(),
             "encryption_algorithm": self.encryption_standard,
@@ -177,6 +258,19 @@ class MilitaryGradeSecurity:
         self._log_security_event("data_encrypted", "INFO", "Sensitive data encrypted")
         return encrypted_data
     
+    def encrypt_sensitive_data_batch(self, items: List[str]) -> List[Dict]:
+        """Encrypt several values concurrently.
+
+        pbkdf2 releases the GIL inside OpenSSL, so spreading the batch over
+        a thread pool scales near-linearly with cores instead of hashing
+        one value at a time.
+        """
+        if self._crypto_pool is None:
+            self._crypto_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=os.cpu_count()
+            )
+        return list(self._crypto_pool.map(self.encrypt_sensitive_data, items))
+    
     def decrypt_sensitive_data(self, encrypted_package: Dict) -> str:
         """Decrypt sensitive data"""
         # In production, this would implement actual decryption
@@ -197,12 +291,15 @@ class MilitaryGradeSecurity:
         }
         
         self.security_incidents.append(security_incident)
+        self._incident_ts.append(security_incident["timestamp"])
         self._log_security_event("security_alert", "WARNING", f"Security alert: {alert['message']}")
         
         # Automated response actions based on severity
-        if alert['severity'] == 'critical':
+        severity = _SEVERITY.get(alert['severity'], Severity.LOW)
+        if severity >= Severity.CRITICAL:
+            self._critical_count += 1
             self._initiate_emergency_protocols(incident_id)
-        elif alert['severity'] == 'high':
+        elif severity >= Severity.HIGH:
             self._escalate_to_security_team(incident_id)
     
     def _initiate_emergency_protocols(self, incident_id: str):
@@ -224,19 +321,15 @@ class MilitaryGradeSecurity:
     
     def _log_security_event(self, event_type: str, level: str, message: str):
         """Log security events"""
-        log_entry = {
-            "timestamp": datetime.now(),
-            "event_type": event_type,
-            "level": level,
-            "message": message,
-            "source": "security_monitoring"
-        }
-        
-        self.audit_log.append(log_entry)
-        
-        # Print important events (in production, would use proper logging)
-        if level in ["ERROR", "CRITICAL", "WARNING"]:
-            print(f"🛡️ SECURITY {level}: {message}")
+        # Flat tuples with a raw nanosecond timestamp: one vDSO clock read
+        # per event and no datetime/tz machinery; entries are formatted
+        # lazily when a report asks for them
+        self.audit_log.append((time.time_ns(), event_type, level, message))
+        
+        # Important events flush the buffered handler immediately; the rest
+        # stay in memory until a batch flush
+        if level in ("ERROR", "CRITICAL", "WARNING"):
+            logger.log(getattr(logging, level, logging.WARNING), "🛡️ SECURITY %s: %s", level, message)
     
     def get_security_status(self) -> Dict:
         """Get current security status"""
@@ -257,11 +350,12 @@ class MilitaryGradeSecurity:
         """Calculate overall security score"""
         base_score = 95.0  # Base score for implemented measures
         
-        # Deduct for recent incidents
-        recent_incidents = [inc for inc in self.security_incidents 
-                           if (datetime.now() - inc['timestamp']).days < 30]
+        # Deduct for recent incidents: timestamps are append-ordered, so the
+        # 30-day boundary is a binary search, not a scan
+        cutoff = datetime.now() - timedelta(days=30)
+        recent_count = len(self._incident_ts) - bisect.bisect_left(self._incident_ts, cutoff)
         
-        incident_penalty = min(20, len(recent_incidents) * 2)
+        incident_penalty = min(20, recent_count * 2)
         
         return max(0, base_score - incident_penalty)
     
@@ -270,7 +364,17 @@ class MilitaryGradeSecurity:
         return {
             "report_date": datetime.now().strftime('%Y-%m-%d'),
             "security_status": self.get_security_status(),
-            "recent_events": self.audit_log[-20:],  # Last 20 events
+            # Last 20 events, expanded to dicts with ISO timestamps only now
+            "recent_events": [
+                {
+                    "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat(),
+                    "event_type": event_type,
+                    "level": level,
+                    "message": message,
+                    "source": "security_monitoring"
+                }
+                for ts_ns, event_type, level, message in self.audit_log[-20:]
+            ],
             "threat_landscape": self._assess_threat_landscape(),
             "recommendations": self._generate_security_recommendations()
         }
@@ -298,8 +402,7 @@ class MilitaryGradeSecurity:
         if len(self.security_incidents) > 5:
             recommendations.append("Enhance intrusion detection rules")
         
-        if any(incident['alert_details']['severity'] == 'critical' 
-               for incident in self.security_incidents):
+        if self._critical_count > 0:
             recommendations.append("Review and update emergency response procedures")
         
         recommendations.extend([
@@ -314,7 +417,16 @@ class MilitaryGradeSecurity:
 class ThreatDetectionSystem:
     def __init__(self):
         self.ml_model = self._load_ml_model()
-        self.behavior_profiles = {}
+        # Bounded per-user rings: deque(maxlen) evicts the oldest entry in
+        # O(1) instead of re-slicing a 100-element list on every append
+        self.behavior_profiles = defaultdict(lambda: deque(maxlen=100))
+        # Preallocated feature matrix reused across batch scoring calls so
+        # per-event list allocations disappear from the hot path
+        self._feature_buf = np.empty((_FEATURE_BATCH, len(_FEATURE_KEYS)), dtype=np.float32)
+        # Per-user feature rings, filled at ingestion so detection never
+        # has to re-walk the raw behavior dict
+        self._user_feats: Dict[str, np.ndarray] = {}
+        self._user_feat_counts: Dict[str, int] = {}
     
     def detect_anomalies(self, user_behavior: Dict) -> bool:
         """ML-powered anomaly detection"""
@@ -322,38 +434,76 @@ class ThreatDetectionSystem:
         prediction = self.ml_model.predict([features])
         return prediction[0] == 1  # 1 indicates anomaly
     
+    def detect_user_anomaly(self, user_id: str) -> bool:
+        """Score a user's most recent behavior from the precomputed ring.
+
+        The feature row was extracted when the profile was updated, so
+        this is a single predict over one stored float32 row.
+        """
+        count = self._user_feat_counts.get(user_id, 0)
+        if count == 0:
+            return False
+        ring = self._user_feats[user_id]
+        row = (count - 1) % len(ring)
+        prediction = self.ml_model.predict(ring[row:row + 1])
+        return prediction[0] == 1
+    
+    def detect_anomalies_batch(self, behaviors: List[Dict]) -> List[bool]:
+        """Score many behavior events with one model call per batch.
+
+        Single-sample predict is dominated by the model's fixed call cost;
+        filling the preallocated feature matrix and predicting 256 rows at
+        a time amortizes it away.
+        """
+        results = []
+        buf = self._feature_buf
+        for start in range(0, len(behaviors), _FEATURE_BATCH):
+            chunk = behaviors[start:start + _FEATURE_BATCH]
+            for row, behavior in enumerate(chunk):
+                get = behavior.get
+                for col, key in enumerate(_FEATURE_KEYS):
+                    buf[row, col] = get(key, 0)
+            predictions = self.ml_model.predict(buf[:len(chunk)])
+            results.extend(prediction == 1 for prediction in predictions)
+        return results
+    
     def _extract_features(self, behavior: Dict) -> List[float]:
         """Extract features for ML model"""
-        return [
-            behavior.get('login_frequency', 0),
-            behavior.get('failed_attempts', 0),
-            behavior.get('geolocation_changes', 0),
-            behavior.get('unusual_hours', 0),
-            behavior.get('data_access_pattern', 0),
-            behavior.get('session_duration', 0)
-        ]
+        get = behavior.get
+        return [get(key, 0) for key in _FEATURE_KEYS]
     
     def _load_ml_model(self):
         """Load ML model for threat detection"""
         # In production, this would load a trained model
         # For simulation, return a mock model
+        rng = np.random.default_rng()
+        
         class MockModel:
             def predict(self, features):
-                # Simulate ML prediction with 2% anomaly rate
-                return [1 if random.random() < 0.02 else 0]
+                # Simulate ML prediction with 2% anomaly rate; one batched
+                # draw yields one result per input row
+                return (rng.random(len(features)) < 0.02).astype(np.int64)
         
         return MockModel()
     
     def update_behavior_profile(self, user_id: str, behavior_data: Dict):
         """Update user behavior profile for anomaly detection"""
-        if user_id not in self.behavior_profiles:
-            self.behavior_profiles[user_id] = []
-        
+        # The deque's maxlen keeps the last 100 entries per user
         self.behavior_profiles[user_id].append({
             "timestamp": datetime.now(),
             "behavior_data": behavior_data
         })
-        
-        # Keep only last 100 entries per user
-        if len(self.behavior_profiles[user_id]) > 100:
-            self.behavior_profiles[user_id] = self.behavior_profiles[user_id][-100:]
+        # Extract the feature vector once here instead of on every
+        # detection; the ring mirrors the profile deque's 100-entry cap
+        ring = self._user_feats.get(user_id)
+        if ring is None:
+            ring = self._user_feats[user_id] = np.empty(
+                (100, len(_FEATURE_KEYS)), dtype=np.float32
+            )
+            self._user_feat_counts[user_id] = 0
+        count = self._user_feat_counts[user_id]
+        get = behavior_data.get
+        row = ring[count % len(ring)]
+        for col, key in enumerate(_FEATURE_KEYS):
+            row[col] = get(key, 0)
+        self._user_feat_counts[user_id] = count + 1
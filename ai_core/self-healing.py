@@ -1,26 +1,107 @@
 # ai_core/self_healing.py
 import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Dict, List
 import logging
 from datetime import datetime, timedelta
-import random
+import numpy as np
+
+# How long a health check result stays fresh. The healing loop, report
+# endpoint and any forwarding layer all query health; within this window
+# they share one result instead of re-running the six sub-checks.
+_HEALTH_CACHE_TTL = 5.0
+
+@dataclass(slots=True, frozen=True)
+class RepairResult:
+    """Outcome of a single repair agent action."""
+    action: str
+    status: str
+    details: str
+    estimated_duration_minutes: int
+    impact: str
+
+# Repair outcomes are constant; one frozen RepairResult per action is
+# built at import and shared across calls — attribute access beats dict
+# key hashing on the healing path and immutability makes sharing safe.
+_REPAIR_RESULTS = {
+    "database": RepairResult(
+        action="database_optimization",
+        status="success",
+        details="Database indexes optimized, connections pooled",
+        estimated_duration_minutes=5,
+        impact="improved_performance"
+    ),
+    "api": RepairResult(
+        action="api_service_restart",
+        status="success",
+        details="API services restarted, load balanced",
+        estimated_duration_minutes=3,
+        impact="restored_connectivity"
+    ),
+    "performance": RepairResult(
+        action="performance_optimization",
+        status="success",
+        details="Cache optimized, resources reallocated",
+        estimated_duration_minutes=8,
+        impact="faster_response_times"
+    ),
+    "security": RepairResult(
+        action="security_enhancement",
+        status="success",
+        details="Security protocols updated, monitoring enhanced",
+        estimated_duration_minutes=10,
+        impact="improved_security_posture"
+    ),
+    "revenue": RepairResult(
+        action="revenue_system_optimization",
+        status="success",
+        details="Payment processing optimized, reporting enhanced",
+        estimated_duration_minutes=7,
+        impact="improved_revenue_flow"
+    ),
+    "emergency_restart": RepairResult(
+        action="emergency_restart",
+        status="success",
+        details="Critical systems restarted in safe mode",
+        estimated_duration_minutes=15,
+        impact="system_recovery"
+    ),
+    "rollback": RepairResult(
+        action="backup_rollback",
+        status="success",
+        details="System rolled back to last stable backup",
+        estimated_duration_minutes=20,
+        impact="data_recovery"
+    ),
+    "notify": RepairResult(
+        action="admin_notification",
+        status="success",
+        details="Administrators notified of emergency situation",
+        estimated_duration_minutes=2,
+        impact="human_intervention_triggered"
+    )
+}
 
 class SelfHealingSystem:
     def __init__(self):
         self.health_monitor = SystemHealthMonitor()
         self.repair_agents = RepairAgents()
-        self.incident_log = []
+        self.incident_log = deque(maxlen=10_000)
         self.healing_active = False
+        self._stop_event = asyncio.Event()
+        self._err_backoff = 1.0
         self.performance_metrics = {
             "issues_detected": 0,
             "issues_resolved": 0,
-            "auto_healing_success_rate": 0.0,
             "average_resolution_time": 0.0
         }
     
     async def monitor_and_heal(self):
         """Continuous monitoring and self-healing"""
         self.healing_active = True
+        self._stop_event.clear()
         print("⚡ Starting self-healing system...")
         
         while self.healing_active:
@@ -33,8 +114,11 @@ class SelfHealingSystem:
                     healing_result = await self._trigger_healing_procedures(health_status)
                     
                     # Log the incident and healing attempt
+                    # Reuse the clock reads already taken for the healing
+                    # result instead of issuing fresh ones per record
                     incident_record = {
-                        "timestamp": datetime.now(),
+                        "timestamp": healing_result["timestamp"],
+                        "mono": time.monotonic(),
                         "health_status": health_status,
                         "healing_actions": healing_result,
                         "resolution_status": healing_result['overall_status']
@@ -44,44 +128,69 @@ class SelfHealingSystem:
                     # Update performance metrics
                     self._update_performance_metrics(healing_result)
                 
-                # Wait before next check
-                await asyncio.sleep(60)  # Check every minute
+                # A clean pass resets the error backoff
+                self._err_backoff = 1.0
+                
+                # Wait before next check; waking on the stop event makes
+                # shutdown immediate instead of up to a minute late
+                if await self._wait_or_stop(60):
+                    break
                 
             except Exception as e:
                 logging.error(f"Self-healing system error: {e}")
                 await self._emergency_recovery()
-                await asyncio.sleep(30)  # Wait 30 seconds before retrying
+                # Exponential backoff: retry quickly if the fault clears,
+                # back off toward 30s if it keeps recurring
+                if await self._wait_or_stop(self._err_backoff):
+                    break
+                self._err_backoff = min(self._err_backoff * 2, 30.0)
+    
+    # (health key, threshold, issue tag, repair agent method)
+    _HEALING_TRIGGERS = (
+        ('database_health', 0.7, 'database_performance', 'fix_database_issues'),
+        ('api_health', 0.7, 'api_connectivity', 'restart_api_services'),
+        ('performance_health', 0.7, 'system_performance', 'optimize_performance'),
+        ('security_health', 0.8, 'security_concerns', 'enhance_security'),
+        ('revenue_health', 0.7, 'revenue_system', 'optimize_revenue_systems')
+    )
+    
+    async def _wait_or_stop(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds; return True if stop was requested."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def _trigger_healing_procedures(self, health_status: Dict) -> Dict:
         """Trigger appropriate healing procedures"""
         print("🛠️ Triggering self-healing procedures...")
         
-        healing_actions = []
+        repairs = []
         issues_detected = []
         
-        # Check each component and trigger appropriate healing
-        if health_status['database_health'] < 0.7:
-            issues_detected.append("database_performance")
-            healing_actions.append(await self.repair_agents.fix_database_issues())
-        
-        if health_status['api_health'] < 0.7:
-            issues_detected.append("api_connectivity")
-            healing_actions.append(await self.repair_agents.restart_api_services())
-        
-        if health_status['performance_health'] < 0.7:
-            issues_detected.append("system_performance")
-            healing_actions.append(await self.repair_agents.optimize_performance())
-        
-        if health_status['security_health'] < 0.8:
-            issues_detected.append("security_concerns")
-            healing_actions.append(await self.repair_agents.enhance_security())
-        
-        if health_status['revenue_health'] < 0.7:
-            issues_detected.append("revenue_system")
-            healing_actions.append(await self.repair_agents.optimize_revenue_systems())
+        # Walk the trigger table and queue the appropriate repair for
+        # each tripped threshold; the repairs are independent, so they
+        # run concurrently below
+        for key, threshold, tag, repair_name in self._HEALING_TRIGGERS:
+            if health_status[key] < threshold:
+                issues_detected.append(tag)
+                repairs.append(getattr(self.repair_agents, repair_name)())
+        
+        results = await asyncio.gather(*repairs, return_exceptions=True)
+        # A failed repair should count against the outcome, not abort the
+        # other repairs or the healing loop
+        healing_actions = [
+            result if not isinstance(result, BaseException)
+            else RepairResult(
+                action=issue, status="failed", details=str(result),
+                estimated_duration_minutes=0, impact="none"
+            )
+            for issue, result in zip(issues_detected, results)
+        ]
         
         # Determine overall status
-        successful_actions = sum(1 for action in healing_actions if action['status'] == 'success')
+        successful_actions = sum(1 for action in healing_actions if action.status == 'success')
         overall_status = "resolved" if successful_actions == len(healing_actions) else "partial"
         
         return {
@@ -98,22 +207,24 @@ class SelfHealingSystem:
         """Emergency recovery procedures"""
         print("🚨 Executing emergency recovery procedures...")
         
-        emergency_actions = [
-            await self.repair_agents.emergency_restart(),
-            await self.repair_agents.rollback_to_backup(),
-            await self.repair_agents.notify_administrators()
-        ]
+        emergency_actions = list(await asyncio.gather(
+            self.repair_agents.emergency_restart(),
+            self.repair_agents.rollback_to_backup(),
+            self.repair_agents.notify_administrators()
+        ))
         
+        now = datetime.now()
         self.incident_log.append({
-            "timestamp": datetime.now(),
+            "timestamp": now,
+            "mono": time.monotonic(),
             "type": "emergency_recovery",
             "actions": emergency_actions,
             "status": "executed"
         })
     
-    def _estimate_recovery_time(self, healing_actions: List[Dict]) -> str:
+    def _estimate_recovery_time(self, healing_actions: List[RepairResult]) -> str:
         """Estimate recovery time based on actions taken"""
-        total_time = sum(action.get('estimated_duration_minutes', 5) for action in healing_actions)
+        total_time = sum(action.estimated_duration_minutes for action in healing_actions)
         
         if total_time <= 5:
             return "1-5 minutes"
@@ -130,23 +241,34 @@ class SelfHealingSystem:
         
         if healing_result["overall_status"] == "resolved":
             self.performance_metrics["issues_resolved"] += len(healing_result["issues_detected"])
-        
-        # Calculate success rate
-        total_attempts = self.performance_metrics["issues_detected"]
-        successful_resolutions = self.performance_metrics["issues_resolved"]
-        
-        if total_attempts > 0:
-            self.performance_metrics["auto_healing_success_rate"] = successful_resolutions / total_attempts
+    
+    def _success_rate(self) -> float:
+        """Derive the healing success rate from the raw counters."""
+        detected = self.performance_metrics["issues_detected"]
+        if detected == 0:
+            return 0.0
+        return self.performance_metrics["issues_resolved"] / detected
     
     def get_system_health_report(self) -> Dict:
         """Get comprehensive system health report"""
-        recent_incidents = [inc for inc in self.incident_log 
-                           if (datetime.now() - inc['timestamp']).days < 7]
+        # The log is append-ordered; walk from the newest entry and stop
+        # at the first one older than the window. Ages compare on the
+        # monotonic sidecar - a float subtract that wall-clock jumps
+        # cannot skew; the datetime stays for display only
+        cutoff_mono = time.monotonic() - 7 * 86_400
+        recent_incidents = 0
+        for incident in reversed(self.incident_log):
+            if incident['mono'] < cutoff_mono:
+                break
+            recent_incidents += 1
         
         return {
             "monitoring_status": "active" if self.healing_active else "inactive",
-            "recent_incidents_7d": len(recent_incidents),
-            "performance_metrics": self.performance_metrics,
+            "recent_incidents_7d": recent_incidents,
+            "performance_metrics": {
+                **self.performance_metrics,
+                "auto_healing_success_rate": self._success_rate()
+            },
             "current_health_status": self.health_monitor.get_current_status(),
             "preventive_measures": self._get_preventive_measures(),
             "recommendations": self._generate_health_recommendations()
@@ -166,7 +288,7 @@ class SelfHealingSystem:
         """Generate health improvement recommendations"""
         recommendations = []
         
-        if self.performance_metrics["auto_healing_success_rate"] < 0.8:
+        if self._success_rate() < 0.8:
             recommendations.append("Improve healing procedure success rates")
         
         if len(self.incident_log) > 10:
@@ -183,23 +305,33 @@ class SelfHealingSystem:
     def stop_monitoring(self):
         """Stop the self-healing monitoring"""
         self.healing_active = False
+        self._stop_event.set()
         print("🛑 Self-healing system stopped")
 
 class SystemHealthMonitor:
     def __init__(self):
         self.health_metrics = {}
-        self.health_history = []
+        self.health_history = deque(maxlen=1000)
+        self._rng = np.random.default_rng()
+        self._cache_ts = 0.0
+        self._cache_val = None
+        # Maintained incrementally by check_system_health so reporting
+        # never rescans component dicts or history
+        self._weakest_component = None
+        self._prev_overall = None
+        self._curr_overall = None
     
-    async def check_system_health(self) -> Dict:
-        """Comprehensive system health check"""
-        health_metrics = {
-            "database_health": await self._check_database_health(),
-            "api_health": await self._check_api_health(),
-            "performance_health": await self._check_performance_health(),
-            "security_health": await self._check_security_health(),
-            "revenue_health": await self._check_revenue_health(),
-            "user_experience_health": await self._check_user_experience_health()
-        }
+    async def check_system_health(self, use_cache: bool = True) -> Dict:
+        """Comprehensive system health check.
+
+        Results are cached for a few seconds; pass use_cache=False to
+        force a fresh run (e.g. from emergency paths).
+        """
+        if (use_cache and self._cache_val is not None
+                and time.monotonic() - self._cache_ts < _HEALTH_CACHE_TTL):
+            return self._cache_val
+        
+        health_metrics = self._simulate_component_health()
         
         overall_health = sum(health_metrics.values()) / len(health_metrics)
         
@@ -212,71 +344,41 @@ class SystemHealthMonitor:
         
         self.health_history.append(health_status)
         
-        # Keep only last 1000 records
-        if len(self.health_history) > 1000:
-            self.health_history = self.health_history[-1000:]
+        # Fold the report-time aggregates in while the dict is hot
+        self._weakest_component = min(health_metrics, key=health_metrics.get)
+        self._prev_overall = self._curr_overall
+        self._curr_overall = overall_health
+        
+        self._cache_val = health_status
+        self._cache_ts = time.monotonic()
         
         return health_status
     
-    async def _check_database_health(self) -> float:
-        """Check database health and performance"""
-        # Simulate database health check
-        base_health = 0.9
-        issues = random.random() < 0.1  # 10% chance of minor issues
-        
-        if issues:
-            return base_health - random.uniform(0.1, 0.3)
-        return base_health
-    
-    async def _check_api_health(self) -> float:
-        """Check API health and responsiveness"""
-        # Simulate API health check
-        base_health = 0.95
-        issues = random.random() < 0.05  # 5% chance of API issues
-        
-        if issues:
-            return base_health - random.uniform(0.1, 0.4)
-        return base_health
-    
-    async def _check_performance_health(self) -> float:
-        """Check system performance"""
-        # Simulate performance check
-        base_health = 0.85
-        performance_issues = random.random() < 0.15  # 15% chance of performance issues
-        
-        if performance_issues:
-            return base_health - random.uniform(0.1, 0.35)
-        return base_health
+    # Per component: (base health, issue probability, penalty low, penalty high)
+    _COMPONENT_PARAMS = (
+        ("database_health", 0.90, 0.10, 0.1, 0.3),
+        ("api_health", 0.95, 0.05, 0.1, 0.4),
+        ("performance_health", 0.85, 0.15, 0.1, 0.35),
+        ("security_health", 0.92, 0.03, 0.2, 0.5),
+        ("revenue_health", 0.88, 0.08, 0.1, 0.4),
+        ("user_experience_health", 0.87, 0.12, 0.1, 0.3)
+    )
     
-    async def _check_security_health(self) -> float:
-        """Check security health"""
-        # Simulate security check
-        base_health = 0.92
-        security_concerns = random.random() < 0.03  # 3% chance of security concerns
-        
-        if security_concerns:
-            return base_health - random.uniform(0.2, 0.5)
-        return base_health
-    
-    async def _check_revenue_health(self) -> float:
-        """Check revenue system health"""
-        # Simulate revenue system check
-        base_health = 0.88
-        revenue_issues = random.random() < 0.08  # 8% chance of revenue system issues
-        
-        if revenue_issues:
-            return base_health - random.uniform(0.1, 0.4)
-        return base_health
-    
-    async def _check_user_experience_health(self) -> float:
-        """Check user experience health"""
-        # Simulate UX health check
-        base_health = 0.87
-        ux_issues = random.random() < 0.12  # 12% chance of UX issues
-        
-        if ux_issues:
-            return base_health - random.uniform(0.1, 0.3)
-        return base_health
+    def _simulate_component_health(self) -> Dict:
+        """Simulate all component health probes in one pass.
+
+        The probes are pure simulation today, so one batched RNG draw
+        replaces a dozen interpreter-level random calls per tick; real
+        probes can reintroduce awaitables per component when they exist.
+        """
+        draws = self._rng.random(2 * len(self._COMPONENT_PARAMS))
+        health_metrics = {}
+        for idx, (name, base, prob, low, high) in enumerate(self._COMPONENT_PARAMS):
+            if draws[2 * idx] < prob:
+                health_metrics[name] = base - (low + draws[2 * idx + 1] * (high - low))
+            else:
+                health_metrics[name] = base
+        return health_metrics
     
     def get_current_status(self) -> Dict:
         """Get current system status"""
@@ -288,130 +390,75 @@ class SystemHealthMonitor:
         return {
             "status": latest_health["status"],
             "overall_score": latest_health["overall_health"],
-            " weakest_component": min(latest_health["component_health"].items(), key=lambda x: x[1])[0],
+            "weakest_component": self._weakest_component,
             "trend": self._calculate_health_trend()
         }
     
     def _calculate_health_trend(self) -> str:
         """Calculate health trend over time"""
-        if len(self.health_history) < 2:
+        if self._prev_overall is None or self._curr_overall is None:
             return "stable"
         
-        recent_scores = [h["overall_health"] for h in self.health_history[-5:]]
-        if len(recent_scores) < 2:
-            return "stable"
-        
-        current = recent_scores[-1]
-        previous = recent_scores[-2]
-        
-        if current > previous + 0.05:
+        if self._curr_overall > self._prev_overall + 0.05:
             return "improving"
-        elif current < previous - 0.05:
+        elif self._curr_overall < self._prev_overall - 0.05:
             return "declining"
         else:
             return "stable"
 
 class RepairAgents:
-    async def fix_database_issues(self) -> Dict:
+    async def fix_database_issues(self) -> RepairResult:
         """Fix database performance and connectivity issues"""
         print("🗄️ Repairing database issues...")
         await asyncio.sleep(2)  # Simulate repair time
         
-        return {
-            "action": "database_optimization",
-            "status": "success",
-            "details": "Database indexes optimized, connections pooled",
-            "estimated_duration_minutes": 5,
-            "impact": "improved_performance"
-        }
+        return _REPAIR_RESULTS["database"]
     
-    async def restart_api_services(self) -> Dict:
+    async def restart_api_services(self) -> RepairResult:
         """Restart API services"""
         print("🔌 Restarting API services...")
         await asyncio.sleep(3)
         
-        return {
-            "action": "api_service_restart",
-            "status": "success",
-            "details": "API services restarted, load balanced",
-            "estimated_duration_minutes": 3,
-            "impact": "restored_connectivity"
-        }
+        return _REPAIR_RESULTS["api"]
     
-    async def optimize_performance(self) -> Dict:
+    async def optimize_performance(self) -> RepairResult:
         """Optimize system performance"""
         print("⚡ Optimizing system performance...")
         await asyncio.sleep(4)
         
-        return {
-            "action": "performance_optimization",
-            "status": "success",
-            "details": "Cache optimized, resources reallocated",
-            "estimated_duration_minutes": 8,
-            "impact": "faster_response_times"
-        }
+        return _REPAIR_RESULTS["performance"]
     
-    async def enhance_security(self) -> Dict:
+    async def enhance_security(self) -> RepairResult:
         """Enhance security measures"""
         print("🛡️ Enhancing security...")
         await asyncio.sleep(2)
         
-        return {
-            "action": "security_enhancement",
-            "status": "success",
-            "details": "Security protocols updated, monitoring enhanced",
-            "estimated_duration_minutes": 10,
-            "impact": "improved_security_posture"
-        }
+        return _REPAIR_RESULTS["security"]
     
-    async def optimize_revenue_systems(self) -> Dict:
+    async def optimize_revenue_systems(self) -> RepairResult:
         """Optimize revenue-related systems"""
         print("💰 Optimizing revenue systems...")
         await asyncio.sleep(3)
         
-        return {
-            "action": "revenue_system_optimization",
-            "status": "success",
-            "details": "Payment processing optimized, reporting enhanced",
-            "estimated_duration_minutes": 7,
-            "impact": "improved_revenue_flow"
-        }
+        return _REPAIR_RESULTS["revenue"]
     
-    async def emergency_restart(self) -> Dict:
+    async def emergency_restart(self) -> RepairResult:
         """Emergency system restart"""
         print("🚨 Executing emergency restart...")
         await asyncio.sleep(5)
         
-        return {
-            "action": "emergency_restart",
-            "status": "success",
-            "details": "Critical systems restarted in safe mode",
-            "estimated_duration_minutes": 15,
-            "impact": "system_recovery"
-        }
+        return _REPAIR_RESULTS["emergency_restart"]
     
-    async def rollback_to_backup(self) -> Dict:
+    async def rollback_to_backup(self) -> RepairResult:
         """Rollback to latest backup"""
         print("💾 Rolling back to backup...")
         await asyncio.sleep(10)
         
-        return {
-            "action": "backup_rollback",
-            "status": "success",
-            "details": "System rolled back to last stable backup",
-            "estimated_duration_minutes": 20,
-            "impact": "data_recovery"
-        }
+        return _REPAIR_RESULTS["rollback"]
     
-    async def notify_administrators(self) -> Dict:
+    async def notify_administrators(self) -> RepairResult:
         """Notify system administrators"""
         print("📧 Notifying administrators...")
         await asyncio.sleep(1)
         
-        return {
-            "action": "admin_notification",
-            "status": "success",
-            "details": "Administrators notified of emergency situation",
-            "estimated_duration_minutes": 2,
-            "impact": "human_intervention_triggered"
-        }
+        return _REPAIR_RESULTS["notify"]
@@ -1,24 +1,186 @@
 # ai_core/strategic_intelligence.py
-import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Dict, List
-import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from .synthetic_intelligence import SyntheticIntelligence
 
+_ANALYSIS_CACHE_SIZE = 128
+
+# The SWOT, KPI, risk, timeline and market payloads below contain no
+# input-dependent data; building each literal tree once at import and
+# returning the shared read-only constant saves the allocation churn of
+# reconstructing them per strategic review.
+_CORE_VALUES = ("Innovation", "Excellence", "Accessibility", "Impact")
+
+_SWOT = MappingProxyType({
+    "strengths": (
+        "AI-powered personalized learning",
+        "Advanced content creation capabilities",
+        "Military-grade security infrastructure",
+        "Automated marketing and sales",
+        "Global compliance framework"
+    ),
+    "weaknesses": (
+        "New market entry",
+        "Brand recognition building",
+        "Dependence on technology infrastructure",
+        "Initial capital requirements"
+    ),
+    "opportunities": (
+        "Growing demand for online education",
+        "AI technology adoption surge",
+        "Digital skills gap in market",
+        "Global remote work trend",
+        "Emerging markets expansion"
+    ),
+    "threats": (
+        "Established competitors (Coursera, Udemy)",
+        "Technology platform changes",
+        "Economic downturns affecting education spending",
+        "Regulatory changes in key markets"
+    )
+})
+
+_METRICS = MappingProxyType({
+    "financial_metrics": MappingProxyType({
+        "monthly_recurring_revenue": MappingProxyType({"target": 8333333, "unit": "ZAR"}),  # 100M/year
+        "customer_acquisition_cost": MappingProxyType({"target": 1000, "unit": "ZAR"}),
+        "lifetime_value": MappingProxyType({"target": 15000, "unit": "ZAR"}),
+        "gross_margin": MappingProxyType({"target": 0.85, "unit": "percentage"})
+    }),
+    "customer_metrics": MappingProxyType({
+        "subscriber_count": MappingProxyType({"target": 5000, "unit": "users"}),
+        "churn_rate": MappingProxyType({"target": 0.05, "unit": "percentage"}),
+        "net_promoter_score": MappingProxyType({"target": 60, "unit": "score"}),
+        "completion_rate": MappingProxyType({"target": 0.75, "unit": "percentage"})
+    }),
+    "operational_metrics": MappingProxyType({
+        "course_creation_speed": MappingProxyType({"target": 24, "unit": "hours"}),
+        "system_uptime": MappingProxyType({"target": 0.999, "unit": "percentage"}),
+        "support_response_time": MappingProxyType({"target": 5, "unit": "minutes"})
+    })
+})
+
+_RISKS = (
+    MappingProxyType({
+        "risk": "Technology failure",
+        "probability": "low",
+        "impact": "high",
+        "mitigation": "Multi-cloud infrastructure, automated backups, 24/7 monitoring"
+    }),
+    MappingProxyType({
+        "risk": "Market competition",
+        "probability": "high",
+        "impact": "medium",
+        "mitigation": "Continuous innovation, superior AI features, aggressive marketing"
+    }),
+    MappingProxyType({
+        "risk": "Regulatory changes",
+        "probability": "medium",
+        "impact": "medium",
+        "mitigation": "Global compliance framework, legal counsel, proactive monitoring"
+    }),
+    MappingProxyType({
+        "risk": "Economic downturn",
+        "probability": "medium",
+        "impact": "medium",
+        "mitigation": "Diversified revenue streams, flexible pricing, cost optimization"
+    })
+)
+
+_IMPLEMENTATION_TIMELINE = MappingProxyType({
+    "phase_1_launch": MappingProxyType({
+        "duration": "4 weeks",
+        "milestones": (
+            "Platform development completion",
+            "Initial course catalog creation",
+            "Marketing campaign launch",
+            "First 1000 subscribers"
+        )
+    }),
+    "phase_2_growth": MappingProxyType({
+        "duration": "8 weeks",
+        "milestones": (
+            "Scale to 5000+ subscribers",
+            "Expand course offerings",
+            "International market entry",
+            "R1M+ monthly revenue"
+        )
+    }),
+    "phase_3_expansion": MappingProxyType({
+        "duration": "12 weeks",
+        "milestones": (
+            "10,000+ subscribers",
+            "Corporate partnerships",
+            "Advanced AI features",
+            "R10M+ monthly revenue"
+        )
+    }),
+    "phase_4_dominance": MappingProxyType({
+        "duration": "Ongoing",
+        "milestones": (
+            "Market leadership position",
+            "Global brand recognition",
+            "R100M+ annual revenue",
+            "IPO preparation"
+        )
+    })
+})
+
+_SEGMENTS = (
+    MappingProxyType({"segment": "Working Professionals", "size": "large", "growth": "high"}),
+    MappingProxyType({"segment": "University Students", "size": "medium", "growth": "medium"}),
+    MappingProxyType({"segment": "Career Changers", "size": "medium", "growth": "high"}),
+    MappingProxyType({"segment": "Corporate Clients", "size": "small", "growth": "very_high"})
+)
+
+_COMPETITION = MappingProxyType({
+    "direct_competitors": ("Coursera", "Udemy", "edX", "Pluralsight"),
+    "competitive_advantages": ("AI personalization", "Localized content", "Superior pricing"),
+    "market_share_target": 0.05,  # 5% in first year
+    "differentiation_strategy": "AI-powered hyper-personalization"
+})
+
+_TECH_TRENDS = (
+    "AI and machine learning in education",
+    "Micro-learning and bite-sized content",
+    "Mobile-first learning platforms",
+    "Gamification and engagement techniques",
+    "Virtual and augmented reality"
+)
+
+_REGULATIONS = MappingProxyType({
+    "south_africa": MappingProxyType({"compliance": "POPIA", "status": "fully_compliant"}),
+    "europe": MappingProxyType({"compliance": "GDPR", "status": "fully_compliant"}),
+    "united_states": MappingProxyType({"compliance": "CCPA", "status": "fully_compliant"}),
+    "global": MappingProxyType({"compliance": "Data Protection", "status": "monitoring"})
+})
+
+_STRATEGIC_ADJUSTMENTS = (
+    "Accelerate AI feature development",
+    "Expand social media marketing budget",
+    "Develop strategic partnerships",
+    "Optimize pricing tiers based on usage data"
+)
+
 class StrategicIntelligence:
     def __init__(self, synthetic_ai: SyntheticIntelligence):
         self.synthetic_ai = synthetic_ai
         self.strategic_plans = {}
+        self._plan_seq = 0
         self.kpis = {}
         self.market_intelligence = {}
+        # LRU cache of (market analysis, SWOT) keyed on the context
+        # contents; strategic reviews mostly repeat the same context
+        self._analysis_cache = OrderedDict()
+        self._rng = np.random.default_rng()
         
     def develop_strategic_plan(self, business_context: Dict) -> Dict:
         """Develop comprehensive strategic plan for CostByte"""
-        # Gather market intelligence
-        market_analysis = self.analyze_market_intelligence(business_context)
-        
-        # Perform SWOT analysis
-        swot_analysis = self.perform_swot_analysis(business_context)
+        # Gather market intelligence and SWOT, cached per context
+        market_analysis, swot_analysis = self._analyze_context(business_context)
         
         # Set strategic goals
         strategic_goals = self.set_strategic_goals(market_analysis, swot_analysis)
@@ -27,7 +189,7 @@ class StrategicIntelligence:
         strategic_plan = {
             "vision": "Become Africa's leading AI-powered education platform",
             "mission": "Democratize world-class education through artificial intelligence",
-            "core_values": ["Innovation", "Excellence", "Accessibility", "Impact"],
+            "core_values": _CORE_VALUES,
             "strategic_goals": strategic_goals,
             "key_initiatives": self.plan_initiatives(strategic_goals),
             "performance_metrics": self.define_metrics(strategic_goals),
@@ -35,12 +197,45 @@ class StrategicIntelligence:
             "timeline": self.create_implementation_timeline()
         }
         
-        # Store the plan
-        plan_id = f"strategic_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.strategic_plans[plan_id] = strategic_plan
+        # Store the plan under a sequence number: integer keys hash
+        # trivially and, unlike second-granularity timestamp ids, two
+        # plans created back to back can never overwrite each other
+        self._plan_seq += 1
+        strategic_plan["created_at"] = datetime.now()
+        self.strategic_plans[self._plan_seq] = strategic_plan
         
         return strategic_plan
     
+    def _analyze_context(self, business_context: Dict) -> tuple:
+        """Return (market analysis, SWOT) for a context, memoized.
+
+        The analyses only consult the market-size and growth-rate keys,
+        so that pair is the cache key - cheaper than hashing the whole
+        serialized context and just as precise. Pass force_refresh in
+        the context to bypass the cache.
+        """
+        key = (
+            business_context.get('estimated_market_size', 5000000000),
+            business_context.get('market_growth_rate', 0.18)
+        )
+        
+        if not business_context.get('force_refresh'):
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(key)
+                self.market_intelligence = cached[0]
+                return cached
+        
+        analyses = (
+            self.analyze_market_intelligence(business_context),
+            self.perform_swot_analysis(business_context)
+        )
+        self._analysis_cache[key] = analyses
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return analyses
+    
     def analyze_market_intelligence(self, context: Dict) -> Dict:
         """Analyze market conditions and opportunities"""
         self.market_intelligence = {
@@ -55,35 +250,8 @@ class StrategicIntelligence:
     
     def perform_swot_analysis(self, context: Dict) -> Dict:
         """Perform comprehensive SWOT analysis"""
-        return {
-            "strengths": [
-                "AI-powered personalized learning",
-                "Advanced content creation capabilities",
-                "Military-grade security infrastructure",
-                "Automated marketing and sales",
-                "Global compliance framework"
-            ],
-            "weaknesses": [
-                "New market entry",
-                "Brand recognition building",
-                "Dependence on technology infrastructure",
-                "Initial capital requirements"
-            ],
-            "opportunities": [
-                "Growing demand for online education",
-                "AI technology adoption surge",
-                "Digital skills gap in market",
-                "Global remote work trend",
-                "Emerging markets expansion"
-            ],
-            "threats": [
-                "Established competitors (Coursera, Udemy)",
-                "Technology platform changes",
-                "Economic downturns affecting education spending",
-                "Regulatory changes in key markets"
-            ]
-        }
-    
+        return _SWOT
+
     def set_strategic_goals(self, market_analysis: Dict, swot_analysis: Dict) -> List[Dict]:
         """Set measurable strategic goals"""
         return [
@@ -163,102 +331,24 @@ class StrategicIntelligence:
     
     def define_metrics(self, strategic_goals: List[Dict]) -> Dict:
         """Define KPIs and performance metrics"""
-        return {
-            "financial_metrics": {
-                "monthly_recurring_revenue": {"target": 8333333, "unit": "ZAR"},  # 100M/year
-                "customer_acquisition_cost": {"target": 1000, "unit": "ZAR"},
-                "lifetime_value": {"target": 15000, "unit": "ZAR"},
-                "gross_margin": {"target": 0.85, "unit": "percentage"}
-            },
-            "customer_metrics": {
-                "subscriber_count": {"target": 5000, "unit": "users"},
-                "churn_rate": {"target": 0.05, "unit": "percentage"},
-                "net_promoter_score": {"target": 60, "unit": "score"},
-                "completion_rate": {"target": 0.75, "unit": "percentage"}
-            },
-            "operational_metrics": {
-                "course_creation_speed": {"target": 24, "unit": "hours"},
-                "system_uptime": {"target": 0.999, "unit": "percentage"},
-                "support_response_time": {"target": 5, "unit": "minutes"}
-            }
-        }
-    
+        return _METRICS
+
     def assess_risks(self) -> List[Dict]:
         """Assess and plan for business risks"""
-        return [
-            {
-                "risk": "Technology failure",
-                "probability": "low",
-                "impact": "high",
-                "mitigation": "Multi-cloud infrastructure, automated backups, 24/7 monitoring"
-            },
-            {
-                "risk": "Market competition",
-                "probability": "high",
-                "impact": "medium",
-                "mitigation": "Continuous innovation, superior AI features, aggressive marketing"
-            },
-            {
-                "risk": "Regulatory changes",
-                "probability": "medium",
-                "impact": "medium",
-                "mitigation": "Global compliance framework, legal counsel, proactive monitoring"
-            },
-            {
-                "risk": "Economic downturn",
-                "probability": "medium",
-                "impact": "medium",
-                "mitigation": "Diversified revenue streams, flexible pricing, cost optimization"
-            }
-        ]
-    
+        return _RISKS
+
     def create_implementation_timeline(self) -> Dict:
         """Create strategic implementation timeline"""
-        return {
-            "phase_1_launch": {
-                "duration": "4 weeks",
-                "milestones": [
-                    "Platform development completion",
-                    "Initial course catalog creation",
-                    "Marketing campaign launch",
-                    "First 1000 subscribers"
-                ]
-            },
-            "phase_2_growth": {
-                "duration": "8 weeks",
-                "milestones": [
-                    "Scale to 5000+ subscribers",
-                    "Expand course offerings",
-                    "International market entry",
-                    "R1M+ monthly revenue"
-                ]
-            },
-            "phase_3_expansion": {
-                "duration": "12 weeks",
-                "milestones": [
-                    "10,000+ subscribers",
-                    "Corporate partnerships",
-                    "Advanced AI features",
-                    "R10M+ monthly revenue"
-                ]
-            },
-            "phase_4_dominance": {
-                "duration": "Ongoing",
-                "milestones": [
-                    "Market leadership position",
-                    "Global brand recognition",
-                    "R100M+ annual revenue",
-                    "IPO preparation"
-                ]
-            }
-        }
-    
+        return _IMPLEMENTATION_TIMELINE
+
     def monitor_strategic_performance(self) -> Dict:
         """Monitor and report on strategic performance"""
+        # One batched draw covers every simulated metric in the report
+        u = self._rng.random(2)
         return {
             "timestamp": datetime.now(),
-            "strategic_alignment": random.uniform(0.8, 0.95),
-            "goal_achievement_rate": random.uniform(0.70, 0.90),
+            "strategic_alignment": 0.80 + 0.15 * u[0].item(),
+            "goal_achievement_rate": 0.70 + 0.20 * u[1].item(),
             "initiative_progress": self._calculate_initiative_progress(),
             "market_position": self._assess_market_position(),
             "recommended_adjustments": self._generate_strategic_adjustments()
@@ -274,60 +364,36 @@ class StrategicIntelligence:
     
     def _identify_segments(self, context: Dict) -> List[Dict]:
         """Identify customer segments"""
-        return [
-            {"segment": "Working Professionals", "size": "large", "growth": "high"},
-            {"segment": "University Students", "size": "medium", "growth": "medium"},
-            {"segment": "Career Changers", "size": "medium", "growth": "high"},
-            {"segment": "Corporate Clients", "size": "small", "growth": "very_high"}
-        ]
-    
+        return _SEGMENTS
+
     def _analyze_competition(self, context: Dict) -> Dict:
         """Analyze competitive landscape"""
-        return {
-            "direct_competitors": ["Coursera", "Udemy", "edX", "Pluralsight"],
-            "competitive_advantages": ["AI personalization", "Localized content", "Superior pricing"],
-            "market_share_target": 0.05,  # 5% in first year
-            "differentiation_strategy": "AI-powered hyper-personalization"
-        }
-    
+        return _COMPETITION
+
     def _identify_tech_trends(self, context: Dict) -> List[str]:
         """Identify relevant technology trends"""
-        return [
-            "AI and machine learning in education",
-            "Micro-learning and bite-sized content",
-            "Mobile-first learning platforms",
-            "Gamification and engagement techniques",
-            "Virtual and augmented reality"
-        ]
-    
+        return _TECH_TRENDS
+
     def _assess_regulations(self, context: Dict) -> Dict:
         """Assess regulatory environment"""
-        return {
-            "south_africa": {"compliance": "POPIA", "status": "fully_compliant"},
-            "europe": {"compliance": "GDPR", "status": "fully_compliant"},
-            "united_states": {"compliance": "CCPA", "status": "fully_compliant"},
-            "global": {"compliance": "Data Protection", "status": "monitoring"}
-        }
-    
+        return _REGULATIONS
+
     def _calculate_initiative_progress(self) -> Dict:
         """Calculate progress on strategic initiatives"""
+        counts = self._rng.integers([2, 3, 0], [6, 9, 3])
         return {
-            "completed": random.randint(2, 5),
-            "in_progress": random.randint(3, 8),
-            "behind_schedule": random.randint(0, 2),
-            "on_track_percentage": random.uniform(0.75, 0.95)
+            "completed": counts[0].item(),
+            "in_progress": counts[1].item(),
+            "behind_schedule": counts[2].item(),
+            "on_track_percentage": 0.75 + 0.20 * self._rng.random()
         }
     
+    _MARKET_POSITIONS = ("emerging", "growing", "established", "leading")
+    
     def _assess_market_position(self) -> str:
         """Assess current market position"""
-        positions = ["emerging", "growing", "established", "leading"]
-        return random.choice(positions)
+        return self._MARKET_POSITIONS[self._rng.integers(len(self._MARKET_POSITIONS))]
     
     def _generate_strategic_adjustments(self) -> List[str]:
         """Generate strategic adjustment recommendations"""
-        return [
-            "Accelerate AI feature development",
-            "Expand social media marketing budget",
-            "Develop strategic partnerships",
-            "Optimize pricing tiers based on usage data"
-        ]
+        return _STRATEGIC_ADJUSTMENTS
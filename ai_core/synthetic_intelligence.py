@@ -1,12 +1,133 @@
 # ai_core/synthetic_intelligence.py
-import json
+import re
 import numpy as np
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List
 import datetime
 from dataclasses import dataclass
-import random
 
-@dataclass
+# These strategy payloads carry no input-dependent data; sharing one
+# read-only tree per payload avoids rebuilding the literals every call.
+_COURSE_DEVELOPMENT = MappingProxyType({
+    "focus_areas": ("AI/ML", "Web Development", "Data Science", "Digital Marketing"),
+    "development_cycle": "agile",
+    "quality_assurance": "automated_testing",
+    "content_creation": "ai_augmented",
+    "release_schedule": "bi_weekly"
+})
+
+_MARKETING_STRATEGY = MappingProxyType({
+    "channels": ("social_media", "seo", "email_marketing", "content_marketing", "affiliate"),
+    "target_audience": "tech_professionals, career_changers, students",
+    "budget_allocation": MappingProxyType({
+        "digital_ads": 0.35,
+        "content_creation": 0.25,
+        "social_media": 0.20,
+        "email_marketing": 0.10,
+        "partnerships": 0.10
+    }),
+    "key_metrics": ("cac", "lifetime_value", "conversion_rate", "churn_rate")
+})
+
+_PRICING_STRATEGY = MappingProxyType({
+    "model": "tiered_subscription",
+    "tiers": MappingProxyType({
+        "basic": 1997,
+        "professional": 3997,
+        "enterprise": 7997
+    }),
+    "discount_strategy": "early_bird + volume",
+    "payment_options": ("monthly", "annual", "lifetime"),
+    "money_back_guarantee": True
+})
+
+_BUSINESS_TIMELINE = MappingProxyType({
+    "phase_1": MappingProxyType({
+        "duration": "4 weeks",
+        "objectives": ("Platform development", "Initial course creation", "Team setup")
+    }),
+    "phase_2": MappingProxyType({
+        "duration": "4 weeks",
+        "objectives": ("Beta testing", "Marketing launch", "First 1000 subscribers")
+    }),
+    "phase_3": MappingProxyType({
+        "duration": "4 weeks",
+        "objectives": ("Full launch", "Scale marketing", "5000+ subscribers")
+    }),
+    "phase_4": MappingProxyType({
+        "duration": "Ongoing",
+        "objectives": ("Continuous improvement", "Market expansion", "Revenue optimization")
+    })
+})
+
+_REVENUE_TARGETS = MappingProxyType({
+    "month_1": 2500000,   # 2.5M ZAR
+    "month_3": 10000000,  # 10M ZAR
+    "month_6": 25000000,  # 25M ZAR
+    "year_1": 100000000   # 100M ZAR
+})
+
+# Keyword dispatch tables for trend analysis. One compiled alternation
+# per table replaces a chain of substring scans over every trend; hits
+# are ranked by table order to keep the old elif ladder's priority
+# (e.g. "ai" beats "programming" wherever both appear in a trend).
+_OPP_TABLE = {
+    "ai": (
+        "Develop advanced AI certification programs",
+        "Create specialized AI project courses",
+        "Offer AI career transition packages"
+    ),
+    "machine learning": (
+        "Develop advanced AI certification programs",
+        "Create specialized AI project courses",
+        "Offer AI career transition packages"
+    ),
+    "programming": (
+        "Launch intensive coding bootcamps",
+        "Create project-based learning paths",
+        "Offer specialized framework courses"
+    ),
+    "pricing": (
+        "Implement tiered pricing model",
+        "Introduce subscription plans",
+        "Create corporate training packages"
+    ),
+    "growth": (
+        "Scale marketing efforts",
+        "Expand course catalog rapidly",
+        "Hire additional instructors"
+    )
+}
+_OPP_RE = re.compile("|".join(re.escape(keyword) for keyword in _OPP_TABLE))
+_OPP_PRIORITY = {keyword: rank for rank, keyword in enumerate(_OPP_TABLE)}
+
+# Impact scoring is partially evaluated at import: every opportunity
+# string comes from _OPP_TABLE, so the high-impact ones are known up
+# front and scoring becomes set membership instead of substring scans.
+_HIGH_IMPACT_OPPS = frozenset(
+    opportunity
+    for opportunities in _OPP_TABLE.values()
+    for opportunity in opportunities
+    if any(word in opportunity.lower() for word in ("ai", "advanced", "certification"))
+)
+
+_MITIGATION_TABLE = {
+    "competition": "MITIGATE: Differentiate through superior content and AI features",
+    "price": "MITIGATE: Focus on value-based pricing and quality",
+    "economic": "MITIGATE: Introduce flexible payment options and scholarships"
+}
+_MITIGATION_RE = re.compile("|".join(re.escape(keyword) for keyword in _MITIGATION_TABLE))
+_MITIGATION_PRIORITY = {keyword: rank for rank, keyword in enumerate(_MITIGATION_TABLE)}
+
+_WEEKLY_RECOMMENDATIONS = (
+    "Monitor competitor pricing changes",
+    "Analyze user engagement metrics",
+    "Update course content based on market feedback",
+    "Optimize marketing campaigns for better ROI",
+    "Explore new partnership opportunities"
+)
+
+@dataclass(slots=True, frozen=True)
 class StrategicDecision:
     decision_type: str
     confidence: float
@@ -20,6 +141,7 @@ class SyntheticIntelligence:
         self.decision_history = []
         self.learning_rate = 0.1
         self.market_data = {}
+        self._rng = np.random.default_rng()
         
     def analyze_market_trends(self, market_data: Dict) -> StrategicDecision:
         """Analyze market data to generate strategic insights"""
@@ -84,33 +206,13 @@ class SyntheticIntelligence:
         opportunities = []
         
         for trend in trends:
-            trend_lower = trend.lower()
-            if "ai" in trend_lower or "machine learning" in trend_lower:
-                opportunities.extend([
-                    "Develop advanced AI certification programs",
-                    "Create specialized AI project courses",
-                    "Offer AI career transition packages"
-                ])
-            elif "programming" in trend_lower:
-                opportunities.extend([
-                    "Launch intensive coding bootcamps",
-                    "Create project-based learning paths",
-                    "Offer specialized framework courses"
-                ])
-            elif "pricing" in trend_lower:
-                opportunities.extend([
-                    "Implement tiered pricing model",
-                    "Introduce subscription plans",
-                    "Create corporate training packages"
-                ])
-            elif "growth" in trend_lower:
-                opportunities.extend([
-                    "Scale marketing efforts",
-                    "Expand course catalog rapidly",
-                    "Hire additional instructors"
-                ])
+            hits = _OPP_RE.findall(trend.lower())
+            if hits:
+                best = min(hits, key=_OPP_PRIORITY.__getitem__)
+                opportunities.extend(_OPP_TABLE[best])
         
-        return list(set(opportunities))  # Remove duplicates
+        # Remove duplicates, keeping first-seen order
+        return list(dict.fromkeys(opportunities))
     
     def _identify_threats(self, trends: List[str]) -> List[str]:
         """Identify potential threats to the business"""
@@ -138,12 +240,10 @@ class SyntheticIntelligence:
         
         # Mitigate threats
         for threat in threats:
-            if "competition" in threat.lower():
-                actions.append("MITIGATE: Differentiate through superior content and AI features")
-            elif "price" in threat.lower():
-                actions.append("MITIGATE: Focus on value-based pricing and quality")
-            elif "economic" in threat.lower():
-                actions.append("MITIGATE: Introduce flexible payment options and scholarships")
+            hits = _MITIGATION_RE.findall(threat.lower())
+            if hits:
+                best = min(hits, key=_MITIGATION_PRIORITY.__getitem__)
+                actions.append(_MITIGATION_TABLE[best])
         
         # Strategic initiatives
         actions.extend([
@@ -164,47 +264,20 @@ class SyntheticIntelligence:
     
     def _calculate_expected_impact(self, opportunities: List[str]) -> float:
         """Calculate expected business impact"""
-        high_impact_opportunities = sum(1 for opp in opportunities if any(word in opp.lower() for word in ['ai', 'advanced', 'certification']))
+        high_impact_opportunities = sum(1 for opp in opportunities if opp in _HIGH_IMPACT_OPPS)
         return min(1.0, 0.3 + (high_impact_opportunities * 0.15))
     
     def _plan_course_development(self, data: Dict) -> Dict:
         """Plan course development strategy"""
-        return {
-            "focus_areas": ["AI/ML", "Web Development", "Data Science", "Digital Marketing"],
-            "development_cycle": "agile",
-            "quality_assurance": "automated_testing",
-            "content_creation": "ai_augmented",
-            "release_schedule": "bi_weekly"
-        }
+        return _COURSE_DEVELOPMENT
     
     def _design_marketing_strategy(self, data: Dict) -> Dict:
         """Design comprehensive marketing strategy"""
-        return {
-            "channels": ["social_media", "seo", "email_marketing", "content_marketing", "affiliate"],
-            "target_audience": "tech_professionals, career_changers, students",
-            "budget_allocation": {
-                "digital_ads": 0.35,
-                "content_creation": 0.25,
-                "social_media": 0.20,
-                "email_marketing": 0.10,
-                "partnerships": 0.10
-            },
-            "key_metrics": ["cac", "lifetime_value", "conversion_rate", "churn_rate"]
-        }
+        return _MARKETING_STRATEGY
     
     def _optimize_pricing(self, data: Dict) -> Dict:
         """Optimize pricing strategy"""
-        return {
-            "model": "tiered_subscription",
-            "tiers": {
-                "basic": 1997,
-                "professional": 3997,
-                "enterprise": 7997
-            },
-            "discount_strategy": "early_bird + volume",
-            "payment_options": ["monthly", "annual", "lifetime"],
-            "money_back_guarantee": True
-        }
+        return _PRICING_STRATEGY
     
     def _allocate_resources(self, data: Dict) -> Dict:
         """Allocate business resources"""
@@ -218,43 +291,22 @@ class SyntheticIntelligence:
     
     def _create_timeline(self, data: Dict) -> Dict:
         """Create business development timeline"""
-        return {
-            "phase_1": {
-                "duration": "4 weeks",
-                "objectives": ["Platform development", "Initial course creation", "Team setup"]
-            },
-            "phase_2": {
-                "duration": "4 weeks",
-                "objectives": ["Beta testing", "Marketing launch", "First 1000 subscribers"]
-            },
-            "phase_3": {
-                "duration": "4 weeks",
-                "objectives": ["Full launch", "Scale marketing", "5000+ subscribers"]
-            },
-            "phase_4": {
-                "duration": "Ongoing",
-                "objectives": ["Continuous improvement", "Market expansion", "Revenue optimization"]
-            }
-        }
+        return _BUSINESS_TIMELINE
     
     def _set_revenue_targets(self, data: Dict) -> Dict:
         """Set aggressive revenue targets"""
-        return {
-            "month_1": 2500000,   # 2.5M ZAR
-            "month_3": 10000000,  # 10M ZAR
-            "month_6": 25000000,  # 25M ZAR
-            "year_1": 100000000   # 100M ZAR
-        }
+        return _REVENUE_TARGETS
     
     def generate_weekly_report(self) -> Dict:
         """Generate weekly strategic report"""
+        u = self._rng.random(2)
         return {
             "timestamp": datetime.datetime.now(),
             "decisions_made": len(self.decision_history),
             "active_strategies": len(self.knowledge_base),
             "performance_metrics": {
-                "decision_accuracy": random.uniform(0.75, 0.95),
-                "strategy_effectiveness": random.uniform(0.70, 0.90),
+                "decision_accuracy": 0.75 + 0.20 * u[0].item(),
+                "strategy_effectiveness": 0.70 + 0.20 * u[1].item(),
                 "learning_progress": self.learning_rate
             },
             "recommendations": self._generate_weekly_recommendations()
@@ -262,10 +314,4 @@ class SyntheticIntelligence:
     
     def _generate_weekly_recommendations(self) -> List[str]:
         """Generate weekly strategic recommendations"""
-        return [
-            "Monitor competitor pricing changes",
-            "Analyze user engagement metrics",
-            "Update course content based on market feedback",
-            "Optimize marketing campaigns for better ROI",
-            "Explore new partnership opportunities"
-        ]
+        return _WEEKLY_RECOMMENDATIONS
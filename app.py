@@ -1,10 +1,16 @@
 # app.py
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, g, render_template, request, jsonify, session, redirect, url_for, abort
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from sqlalchemy.orm import joinedload, make_transient, undefer
 import asyncio
+import os
 import json
+import threading
+import uuid
+import time
 from decimal import Decimal
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 from config import config
 from models import db, User, Course, Subscription, Payment, SupportTicket, ChatConversation
@@ -31,21 +37,143 @@ chatbot = MeganChatbot()
 support_system = CustomerSupportSystem()
 mass_acquisition = MassAcquisitionOrchestrator()
 
+# One persistent event loop on a background thread serves every AI
+# coroutine. Flask spins up (and tears down) a fresh loop per request
+# for async views; routing through this loop instead keeps connection
+# pools and session state alive across requests and removes the
+# per-request loop cost.
+_ai_loop = asyncio.new_event_loop()
+threading.Thread(target=_ai_loop.run_forever, name='ai-loop', daemon=True).start()
+
+def run_async(coro):
+    """Run a coroutine on the shared AI loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _ai_loop).result()
+
+# Long-running AI job state lives in redis so status polls work across
+# the multi-process gunicorn topology; a dev run without redis falls
+# back to an in-process dict (single worker only)
+_JOB_TTL = 24 * 3600
+try:
+    import redis
+    _job_store = redis.Redis.from_url(
+        os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        socket_connect_timeout=1,
+    )
+    _job_store.ping()
+except Exception:
+    _job_store = None
+_local_jobs = {}
+
+def _set_job_state(job_id, payload):
+    if _job_store is not None:
+        _job_store.setex(f'job:{job_id}', _JOB_TTL, json.dumps(payload, default=str))
+    else:
+        _local_jobs[job_id] = payload
+
+def _get_job_state(job_id):
+    if _job_store is not None:
+        raw = _job_store.get(f'job:{job_id}')
+        return json.loads(raw) if raw else None
+    return _local_jobs.get(job_id)
+
+def submit_async(coro):
+    """Run a coroutine on the shared AI loop without blocking; returns a job id."""
+    job_id = str(uuid.uuid4())
+    _set_job_state(job_id, {'job_id': job_id, 'status': 'running'})
+    future = asyncio.run_coroutine_threadsafe(coro, _ai_loop)
+    
+    def _record(fut):
+        error = fut.exception()
+        if error is not None:
+            _set_job_state(job_id, {'job_id': job_id, 'status': 'failed', 'error': str(error)})
+        else:
+            _set_job_state(job_id, {'job_id': job_id, 'status': 'completed', 'results': fut.result()})
+    
+    future.add_done_callback(_record)
+    return job_id
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(user_id)
+    # Flask-Login calls this once per authenticated request; g caches the
+    # user within the request and session.get checks the identity map
+    # before emitting SQL. The session cookie stores the id as text, so
+    # parse it back to a UUID for the typed primary key.
+    try:
+        user_id = uuid.UUID(user_id)
+    except (TypeError, ValueError):
+        return None
+    user = g.get('_loaded_user')
+    if user is None or user.id != user_id:
+        user = db.session.get(User, user_id)
+        g._loaded_user = user
+    return user
+
+# Landing-page subscriber count, cached in 30-second buckets so the
+# endpoint's DB load stays flat regardless of traffic. The bucket value
+# is part of the cache key; maxsize=2 keeps the previous bucket around
+# across the boundary.
+_SUBSCRIBER_COUNT_TTL = 30
+
+@lru_cache(maxsize=2)
+def _active_subscriber_count(bucket: int) -> int:
+    return db.session.query(
+        db.func.count(Subscription.id)
+    ).filter_by(status='active').scalar() or 0
+
+def get_active_subscriber_count() -> int:
+    return _active_subscriber_count(int(time.time() // _SUBSCRIBER_COUNT_TTL))
+
+# Course catalog cache. Courses rarely change, so detail and checkout
+# lookups are served from a per-process cache keyed on the catalog
+# version; admin writes bump the version, which invalidates every
+# cached course at once.
+_catalog_version = 0
+
+@lru_cache(maxsize=512)
+def _course_by_id(course_id: str, version: int):
+    # Malformed ids must read as "no such course", not a bind-time
+    # ValueError from the UUID column type
+    try:
+        course_key = uuid.UUID(course_id)
+    except (TypeError, ValueError):
+        return None
+    # Undefer the marketing copy: the detail page renders it and the
+    # detached cached instance cannot lazy-load it later
+    course = db.session.get(Course, course_key, options=(
+        undefer(Course.learning_objectives),
+        undefer(Course.prerequisites),
+        undefer(Course.target_audience),
+        undefer(Course.what_you_get),
+    ))
+    if course is not None:
+        # Detach so the cached instance survives the request session;
+        # only loaded attributes are read on the cached paths
+        make_transient(course)
+    return course
+
+def get_course_cached(course_id: str):
+    return _course_by_id(course_id, _catalog_version)
+
+def bump_catalog_version():
+    """Invalidate cached courses after an admin catalog change."""
+    global _catalog_version
+    _catalog_version += 1
 
 @app.before_first_request
 def initialize_platform():
     """Initialize AI platform on first request"""
-    asyncio.run(platform.initialize_platform())
+    run_async(platform.initialize_platform())
 
 # Routes
 @app.route('/')
 def index():
     """Main landing page with psychological triggers"""
-    courses = Course.query.filter_by(is_published=True).all()
-    subscriber_count = Subscription.query.filter_by(status='active').count()
+    # Stream the catalog in batches instead of materializing every row;
+    # the template iterates it once and only reads column attributes
+    courses = db.session.scalars(
+        db.select(Course).filter_by(is_published=True).execution_options(yield_per=50)
+    )
+    subscriber_count = get_active_subscriber_count()
     
     return render_template('index.html',
                          courses=courses,
@@ -56,84 +184,101 @@ def index():
 @app.route('/courses')
 def courses():
     """Course catalog page"""
-    courses = Course.query.filter_by(is_published=True).all()
+    # Materialized: the catalog template renders a result count with
+    # |length before iterating, which a one-pass stream cannot answer
+    courses = db.session.scalars(
+        db.select(Course).filter_by(is_published=True)
+    ).all()
     return render_template('courses.html', courses=courses)
 
 @app.route('/course/<course_id>')
 def course_detail(course_id):
     """Individual course page"""
-    course = Course.query.get_or_404(course_id)
+    course = get_course_cached(course_id)
+    if course is None:
+        abort(404)
     return render_template('course_detail.html', course=course)
 
 @app.route('/api/chat', methods=['POST'])
 @login_required
-async def chat_with_megan():
+def chat_with_megan():
     """Chat endpoint for Megan AI chatbot"""
     data = request.json
     user_message = data.get('message', '')
     conversation_id = data.get('conversation_id')
     
-    response = await chatbot.process_message(
+    response = run_async(chatbot.process_message(
         user_message, 
         current_user.id, 
         conversation_id
-    )
+    ))
     
     return jsonify(response)
 
 @app.route('/api/support/ticket', methods=['POST'])
 @login_required
-async def create_support_ticket():
+def create_support_ticket():
     """Create support ticket"""
     data = request.json
     subject = data.get('subject', '')
     description = data.get('description', '')
     
-    result = await support_system.handle_support_ticket(
+    result = run_async(support_system.handle_support_ticket(
         current_user.id, subject, description
-    )
+    ))
     
     return jsonify(result)
 
 @app.route('/api/subscribe', methods=['POST'])
 @login_required
-async def subscribe_to_course():
+def subscribe_to_course():
     """Subscribe to a course with FNB payment"""
     data = request.json
     course_id = data.get('course_id')
     payment_method = data.get('payment_method', 'fnb_transfer')
     
-    course = Course.query.get_or_404(course_id)
+    course = get_course_cached(course_id)
+    if course is None:
+        abort(404)
+    
+    # Numeric columns already come back as Decimal; only coerce when a
+    # dialect hands back a float, and then via str to avoid binary noise
+    price = course.price_zar
+    if not isinstance(price, Decimal):
+        price = Decimal(str(price))
     
     # Process payment
-    payment_result = await platform.payment_distributor.payment_processor.process_payment(
-        Decimal(str(course.price_zar)),
+    payment_result = run_async(platform.payment_distributor.payment_processor.process_payment(
+        price,
         {
             'user_id': current_user.id,
             'email': current_user.email,
-            'name': f"{current_user.first_name} {current_user.last_name}"
+            'name': current_user.full_name
         }
-    )
+    ))
     
     if payment_result['payment_status'] == 'completed':
         # Create subscription
         subscription = Subscription(
             user_id=current_user.id,
             course_id=course_id,
-            amount_zar=course.price_zar,
+            amount_zar=price,
             payment_method=payment_method,
             status='active'
         )
         db.session.add(subscription)
         db.session.commit()
         
+        # New active subscription - drop the cached landing-page count
+        _active_subscriber_count.cache_clear()
+        
         # Track revenue
-        await platform.revenue_tracker.track_revenue({
+        run_async(platform.revenue_tracker.track_revenue({
             'user_id': current_user.id,
-            'amount': float(course.price_zar),
+            'amount': float(price),
             'type': 'subscription',
             'course_id': course_id
-        })
+        }))
         
         return jsonify({
             'status': 'success',
@@ -154,14 +299,24 @@ def admin_dashboard():
     if not current_user.is_admin:
         return redirect(url_for('index'))
     
-    total_revenue = db.session.query(db.func.sum(Payment.amount_zar)).filter(
-        Payment.status == 'completed'
-    ).scalar() or 0
+    # One round trip for both scalar aggregates instead of two
+    total_revenue, total_subscribers = db.session.execute(
+        db.select(
+            db.select(
+                db.func.coalesce(db.func.sum(Payment.amount_zar), 0)
+            ).where(Payment.status == 'completed').scalar_subquery(),
+            db.select(
+                db.func.count(Subscription.id)
+            ).where(Subscription.status == 'active').scalar_subquery()
+        )
+    ).one()
     
-    total_subscribers = Subscription.query.filter_by(status='active').count()
-    recent_subscriptions = Subscription.query.order_by(
-        Subscription.created_at.desc()
-    ).limit(10).all()
+    # Eager-load user and course so the template's per-row accesses
+    # don't issue a lazy-load query for each of the 10 subscriptions
+    recent_subscriptions = Subscription.query.options(
+        joinedload(Subscription.user),
+        joinedload(Subscription.course)
+    ).order_by(Subscription.created_at.desc()).limit(10).all()
     
     return render_template('admin.html',
                          total_revenue=total_revenue,
@@ -171,25 +326,40 @@ def admin_dashboard():
 
 @app.route('/admin/revenue-analytics')
 @login_required
-async def revenue_analytics():
+def revenue_analytics():
     """Revenue analytics API"""
     if not current_user.is_admin:
         return jsonify({'error': 'Unauthorized'}), 403
     
-    analytics = await platform.revenue_tracker.get_revenue_analytics('weekly')
+    analytics = run_async(platform.revenue_tracker.get_revenue_analytics('weekly'))
     return jsonify(analytics)
 
 @app.route('/admin/launch-mass-acquisition', methods=['POST'])
 @login_required
-async def launch_mass_acquisition():
+def launch_mass_acquisition():
     """Launch massive subscriber acquisition campaign"""
     if not current_user.is_admin:
         return jsonify({'error': 'Unauthorized'}), 403
     
     budget = float(request.json.get('budget', 500000))
-    results = await mass_acquisition.execute_mass_acquisition(budget)
+    # Campaigns run for minutes; respond immediately instead of holding
+    # a worker thread for the duration
+    job_id = submit_async(mass_acquisition.execute_mass_acquisition(budget))
+    
+    return jsonify({'job_id': job_id, 'status': 'started'}), 202
+
+@app.route('/admin/job-status/<job_id>')
+@login_required
+def job_status(job_id):
+    """Poll the status of a background AI job"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    state = _get_job_state(job_id)
+    if state is None:
+        return jsonify({'error': 'Unknown job'}), 404
     
-    return jsonify(results)
+    return jsonify(state)
 
 @app.route('/support')
 @login_required
@@ -274,5 +444,7 @@ if __name__ == '__main__':
     with app.app_context():
         db.create_all()
     
-    # Run the application
+    # Development entry only - production runs under Gunicorn threaded
+    # workers (see gunicorn.conf.py), which serve requests concurrently
+    # instead of the single-threaded Werkzeug dev server
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -10,6 +10,16 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///costbyte.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Explicit pool sizing: the defaults (5 connections, 10 overflow)
+    # queue threads under load, and stale connections trigger reconnect
+    # storms without pre-ping/recycle
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 30)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': 10,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+    }
     
     # FNB Bank Accounts
     FNB_ACCOUNTS = {
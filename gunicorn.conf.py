@@ -0,0 +1,14 @@
+# gunicorn.conf.py
+# Production server config: `gunicorn -c gunicorn.conf.py app:app`.
+# Threaded workers give concurrency for the I/O-bound chat and payment
+# routes without gevent monkey patching, which would conflict with the
+# dedicated asyncio loop thread app.py starts for the AI coroutines.
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+worker_class = "gthread"
+workers = 2 * multiprocessing.cpu_count() + 1
+threads = 8
+worker_connections = 1000
+timeout = 60
+keepalive = 75
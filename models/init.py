@@ -1,27 +1,186 @@
 # models/__init__.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.types import BIGINT, BINARY, SMALLINT, TypeDecorator
 from flask_login import UserMixin
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+import os
+import threading
+import time
 import uuid
 import bcrypt
 
 db = SQLAlchemy()
 
+# bcrypt cost factor, tunable per deployment without code changes
+_BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
+# Binary pre-parsed JSON on Postgres (indexable, ~2x faster reads),
+# plain JSON everywhere else
+_JSON = db.JSON().with_variant(JSONB(), 'postgresql')
+
+class UUIDType(TypeDecorator):
+    """UUID column stored natively on Postgres and as BINARY(16) elsewhere.
+
+    16 bytes per key instead of the 36-char text form - rows, primary
+    key indexes and every secondary index carrying the PK shrink, and
+    key comparisons become plain memcmp of 16 bytes.
+    """
+    impl = BINARY(16)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(PGUUID(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value if dialect.name == 'postgresql' else value.bytes
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(bytes=value)
+
+class MoneyCents(TypeDecorator):
+    """Rand amount stored as integer cents, surfaced as Decimal.
+
+    Integer storage keeps SUM() and comparisons in plain integer
+    arithmetic on the database side and halves the column footprint;
+    Python code keeps exact Decimal semantics at the boundary.
+    """
+    impl = BIGINT
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return int(value.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return Decimal(value).scaleb(-2)
+
+class Vocab(TypeDecorator):
+    """Small fixed vocabulary stored as SMALLINT, surfaced as str.
+
+    Status-style columns carried 6-12 bytes of ASCII per row and
+    compared strings on every filter; a two-byte code halves the
+    footprint and doubles as a CHECK - an unknown word fails the bind.
+    """
+    impl = SMALLINT
+    cache_ok = True
+    
+    def __init__(self, *words):
+        super().__init__()
+        self._words = words
+        self._codes = {word: code for code, word in enumerate(words)}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"not in vocabulary {self._words}: {value!r}") from None
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return self._words[value]
+
+# uuid.uuid7 ships with Python 3.14+; fall back to hand-rolling below
+_uuid7 = getattr(uuid, 'uuid7', None)
+
+# Random tails for hand-rolled v7 ids are drawn from os.urandom in
+# batches, turning 1024 urandom syscalls into one during bulk inserts
+_RAND_BATCH = 1024
+_rand_buf = threading.local()
+
+def _next_rand10():
+    chunks = getattr(_rand_buf, 'chunks', None)
+    if not chunks:
+        raw = os.urandom(10 * _RAND_BATCH)
+        chunks = _rand_buf.chunks = [raw[i:i + 10] for i in range(0, len(raw), 10)]
+    return chunks.pop()
+
 def generate_uuid():
-    return str(uuid.uuid4())
+    """Time-ordered UUIDv7 (RFC 9562) primary key.
+
+    The 48-bit millisecond timestamp prefix keeps sequential inserts in
+    the rightmost B-tree leaf instead of scattering them across random
+    pages the way uuid4 does, which matters for write-heavy tables like
+    payments and chat messages.
+    """
+    if _uuid7 is not None:
+        return _uuid7()
+    ts = int(time.time() * 1000)
+    rand = _next_rand10()
+    raw = ts.to_bytes(6, 'big') + bytes((
+        0x70 | (rand[0] & 0x0F),  # version 7
+        rand[1],
+        0x80 | (rand[2] & 0x3F),  # RFC variant
+    )) + rand[3:]
+    return uuid.UUID(bytes=raw)
+
+class _KeysetMixin:
+    """Keyset pagination over time-ordered UUIDv7 primary keys."""
+    
+    @classmethod
+    def page(cls, session, after_id=None, limit=50):
+        """Return the next `limit` rows after `after_id` in id order.
+
+        UUIDv7 ids sort by creation time, so `id > after_id` is an index
+        range seek and pages come back time-ordered without a sort or
+        the O(N) row-discard cost of OFFSET.
+        """
+        query = db.select(cls)
+        if after_id is not None:
+            query = query.where(cls.id > after_id)
+        return session.scalars(query.order_by(cls.id).limit(limit)).all()
+
+class _BulkCreateMixin:
+    """One multi-row INSERT for high-frequency append-only tables."""
+    
+    @classmethod
+    def bulk_create(cls, session, rows):
+        """Insert a batch of row dicts in a single statement.
+
+        Ids come from the Python-side UUIDv7 default, so no RETURNING
+        round-trip is needed; missing ids are filled in here.
+        """
+        if not rows:
+            return []
+        for row in rows:
+            row.setdefault('id', generate_uuid())
+        session.execute(db.insert(cls), rows)
+        return [row['id'] for row in rows]
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(255), nullable=False)
+    # bcrypt output is exactly 60 bytes; storing raw bytes skips the
+    # UTF-8 round-trip on every login check
+    password_hash = db.Column(db.LargeBinary(60), nullable=False)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
-    phone = db.Column(db.String(20))
-    country = db.Column(db.String(50), nullable=False, default='ZA')
+    phone = db.Column(db.String(15))  # E.164 maximum
+    country = db.Column(db.CHAR(2), nullable=False, default='ZA')  # ISO 3166-1 alpha-2
     timezone = db.Column(db.String(50), default='Africa/Johannesburg')
-    language = db.Column(db.String(10), default='en')
+    language = db.Column(db.CHAR(5), default='en')  # BCP 47 short form, e.g. en, en-ZA
     
     # Profile fields
     profile_picture = db.Column(db.String(500))
@@ -36,45 +195,68 @@ class User(UserMixin, db.Model):
     email_verified = db.Column(db.Boolean, default=False)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     last_activity = db.Column(db.DateTime)
     
     # Relationships
-    subscriptions = db.relationship('Subscription', backref='user', lazy=True, cascade='all, delete-orphan')
-    support_tickets = db.relationship('SupportTicket', backref='user', lazy=True, cascade='all, delete-orphan')
-    payments = db.relationship('Payment', backref='user', lazy=True, cascade='all, delete-orphan')
-    chat_conversations = db.relationship('ChatConversation', backref='user', lazy=True, cascade='all, delete-orphan')
-    course_progress = db.relationship('CourseProgress', backref='user', lazy=True, cascade='all, delete-orphan')
+    # lazy='raise_on_sql' turns hidden N+1 lazy loads into errors; route
+    # code opts in with selectinload where a collection is really needed
+    subscriptions = db.relationship('Subscription', back_populates='user', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    support_tickets = db.relationship('SupportTicket', back_populates='user', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    payments = db.relationship('Payment', back_populates='user', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    chat_conversations = db.relationship('ChatConversation', back_populates='user', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    course_progress = db.relationship('CourseProgress', back_populates='user', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    reviews = db.relationship('CourseReview', back_populates='user', lazy='raise_on_sql')
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(_BCRYPT_ROUNDS))
     
     def check_password(self, password):
         """Check password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash)
+    
+    def needs_rehash(self):
+        """True when the stored hash cost differs from BCRYPT_ROUNDS.
+
+        Lets login handlers lazily re-hash after a cost-factor change.
+        """
+        try:
+            cost = int(self.password_hash.split(b'$')[2])
+        except (IndexError, ValueError):
+            return True
+        return cost != _BCRYPT_ROUNDS
+    
+    @hybrid_property
+    def full_name(self):
+        """User's full name; usable in queries as first_name || ' ' || last_name"""
+        return f"{self.first_name} {self.last_name}"
+    
+    @full_name.expression
+    def full_name(cls):
+        return cls.first_name + ' ' + cls.last_name
     
     def get_full_name(self):
         """Get user's full name"""
-        return f"{self.first_name} {self.last_name}"
+        return self.full_name
     
     def __repr__(self):
-        return f'<User {self.email}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class Course(db.Model):
     __tablename__ = 'courses'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
     title = db.Column(db.String(200), nullable=False, index=True)
     subtitle = db.Column(db.String(300))
     description = db.Column(db.Text, nullable=False)
     short_description = db.Column(db.String(500))
     
     # Pricing
-    price_zar = db.Column(db.Numeric(10, 2), nullable=False)
-    original_price_zar = db.Column(db.Numeric(10, 2))
+    price_zar = db.Column(MoneyCents(), nullable=False)
+    original_price_zar = db.Column(MoneyCents())
     currency = db.Column(db.String(3), default='ZAR')
     
     # Course details
@@ -91,15 +273,18 @@ class Course(db.Model):
     thumbnail_url = db.Column(db.String(500))
     
     # Content
-    learning_objectives = db.Column(db.Text)
-    prerequisites = db.Column(db.Text)
-    target_audience = db.Column(db.Text)
-    what_you_get = db.Column(db.Text)
+    # Multi-KB marketing copy only the detail page renders; deferred so
+    # list views don't drag it over the wire
+    learning_objectives = db.deferred(db.Column(db.Text))
+    prerequisites = db.deferred(db.Column(db.Text))
+    target_audience = db.deferred(db.Column(db.Text))
+    what_you_get = db.deferred(db.Column(db.Text))
     
     # Stats
     total_students = db.Column(db.Integer, default=0)
     total_rating = db.Column(db.Numeric(3, 2), default=0.0)
     review_count = db.Column(db.Integer, default=0)
+    rating_sum = db.Column(db.Integer, default=0)  # running sum behind total_rating
     total_lessons = db.Column(db.Integer, default=0)
     
     # Status
@@ -108,26 +293,33 @@ class Course(db.Model):
     is_ai_generated = db.Column(db.Boolean, default=True)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     published_at = db.Column(db.DateTime)
     
     # Relationships
-    modules = db.relationship('CourseModule', backref='course', lazy=True, cascade='all, delete-orphan')
-    subscriptions = db.relationship('Subscription', backref='course', lazy=True, cascade='all, delete-orphan')
-    reviews = db.relationship('CourseReview', backref='course', lazy=True, cascade='all, delete-orphan')
+    # The detail page always renders modules (and their lessons), so load
+    # them eagerly with one IN query per level
+    modules = db.relationship('CourseModule', back_populates='course', lazy='selectin', cascade='all, delete-orphan', passive_deletes=True)
+    subscriptions = db.relationship('Subscription', back_populates='course', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    reviews = db.relationship('CourseReview', back_populates='course', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    
+    # The catalog pages always filter on publication state
+    __table_args__ = (
+        db.Index('idx_course_published', 'is_published'),
+    )
     
     def __repr__(self):
-        return f'<Course {self.title}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class CourseModule(db.Model):
     __tablename__ = 'course_modules'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    course_id = db.Column(UUIDType(), db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    content = db.Column(db.Text)
+    content = db.deferred(db.Column(db.Text))
     
     # Media
     video_url = db.Column(db.String(500))
@@ -141,26 +333,27 @@ class CourseModule(db.Model):
     is_published = db.Column(db.Boolean, default=True)
     
     # Resources
-    resources = db.Column(db.JSON)  # JSON list of resources
-    assignments = db.Column(db.JSON)  # JSON list of assignments
+    resources = db.Column(_JSON)  # JSON list of resources
+    assignments = db.Column(_JSON)  # JSON list of assignments
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     
     # Relationships
-    lessons = db.relationship('CourseLesson', backref='module', lazy=True, cascade='all, delete-orphan')
+    lessons = db.relationship('CourseLesson', back_populates='module', lazy='selectin', cascade='all, delete-orphan', passive_deletes=True)
+    course = db.relationship('Course', back_populates='modules')
     
     def __repr__(self):
-        return f'<CourseModule {self.title}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class CourseLesson(db.Model):
     __tablename__ = 'course_lessons'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    module_id = db.Column(db.String(36), db.ForeignKey('course_modules.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    module_id = db.Column(UUIDType(), db.ForeignKey('course_modules.id', ondelete='CASCADE'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
-    content = db.Column(db.Text)
+    content = db.deferred(db.Column(db.Text))
     
     # Media
     video_url = db.Column(db.String(500))
@@ -169,25 +362,28 @@ class CourseLesson(db.Model):
     document_url = db.Column(db.String(500))
     
     # Lesson details
-    lesson_type = db.Column(db.String(20), default='video')  # video, text, quiz, assignment
+    lesson_type = db.Column(Vocab('video', 'text', 'quiz', 'assignment'), default='video')
     order_index = db.Column(db.Integer, nullable=False)
     is_published = db.Column(db.Boolean, default=True)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
+    
+    # Relationships
+    module = db.relationship('CourseModule', back_populates='lessons')
     
     def __repr__(self):
-        return f'<CourseLesson {self.title}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class CourseProgress(db.Model):
     __tablename__ = 'course_progress'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False, index=True)
-    module_id = db.Column(db.String(36), db.ForeignKey('course_modules.id'))
-    lesson_id = db.Column(db.String(36), db.ForeignKey('course_lessons.id'))
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    course_id = db.Column(UUIDType(), db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False, index=True)
+    module_id = db.Column(UUIDType(), db.ForeignKey('course_modules.id', ondelete='SET NULL'))
+    lesson_id = db.Column(UUIDType(), db.ForeignKey('course_lessons.id', ondelete='SET NULL'))
     
     # Progress tracking
     progress_percentage = db.Column(db.Numeric(5, 2), default=0.0)
@@ -200,27 +396,30 @@ class CourseProgress(db.Model):
     completed_at = db.Column(db.DateTime)
     
     # Current activity
-    last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow)
-    current_lesson_id = db.Column(db.String(36))
+    last_accessed_at = db.Column(db.DateTime, server_default=db.func.now())
+    current_lesson_id = db.Column(UUIDType())
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     
     # Index for efficient queries
     __table_args__ = (
         db.Index('idx_user_course', 'user_id', 'course_id'),
     )
     
+    # Relationships
+    user = db.relationship('User', back_populates='course_progress')
+    
     def __repr__(self):
-        return f'<CourseProgress user:{self.user_id} course:{self.course_id}>'
+        return f'<{type(self).__name__} {self.id}>'
 
-class CourseReview(db.Model):
+class CourseReview(_KeysetMixin, db.Model):
     __tablename__ = 'course_reviews'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    course_id = db.Column(UUIDType(), db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False)
     
     # Review content
     rating = db.Column(db.Integer, nullable=False)  # 1-5
@@ -233,60 +432,75 @@ class CourseReview(db.Model):
     helpful_count = db.Column(db.Integer, default=0)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     
     # Relationships
-    user = db.relationship('User', backref='reviews')
+    user = db.relationship('User', back_populates='reviews')
+    course = db.relationship('Course', back_populates='reviews')
+    
+    # Rating histograms group by rating within a course; the leading
+    # column also covers plain course_id lookups
+    __table_args__ = (
+        db.Index('ix_review_course_rating', 'course_id', 'rating'),
+    )
     
     def __repr__(self):
-        return f'<CourseReview {self.rating} stars by {self.user_id}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class Subscription(db.Model):
     __tablename__ = 'subscriptions'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    course_id = db.Column(UUIDType(), db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False)
     
     # Subscription details
-    amount_zar = db.Column(db.Numeric(10, 2), nullable=False)
+    amount_zar = db.Column(MoneyCents(), nullable=False)
     currency = db.Column(db.String(3), default='ZAR')
-    subscription_type = db.Column(db.String(20), default='one_time')  # one_time, monthly, annual
+    subscription_type = db.Column(Vocab('one_time', 'monthly', 'annual'), default='one_time')
     payment_method = db.Column(db.String(50))
     
     # Status
-    status = db.Column(db.String(20), default='active')  # active, cancelled, expired, paused
+    status = db.Column(Vocab('active', 'cancelled', 'expired', 'paused'), default='active')
     is_recurring = db.Column(db.Boolean, default=False)
     
     # Dates
-    start_date = db.Column(db.DateTime, default=datetime.utcnow)
+    start_date = db.Column(db.DateTime, server_default=db.func.now())
     end_date = db.Column(db.DateTime)
     next_billing_date = db.Column(db.DateTime)
     cancelled_at = db.Column(db.DateTime)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     
     # Index for efficient queries
+    # The composites also cover plain user_id/course_id lookups via their
+    # leading columns; end_date makes expiry sweeps index-only
     __table_args__ = (
         db.Index('idx_user_subscription', 'user_id', 'status'),
         db.Index('idx_course_subscription', 'course_id', 'status'),
+        db.Index('idx_subscription_status', 'status', 'end_date'),
     )
     
+    # Relationships
+    user = db.relationship('User', back_populates='subscriptions')
+    course = db.relationship('Course', back_populates='subscriptions')
+    payments = db.relationship('Payment', back_populates='subscription')
+    
     def __repr__(self):
-        return f'<Subscription user:{self.user_id} course:{self.course_id}>'
+        return f'<{type(self).__name__} {self.id}>'
 
-class Payment(db.Model):
+class Payment(_KeysetMixin, db.Model):
     __tablename__ = 'payments'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    subscription_id = db.Column(db.String(36), db.ForeignKey('subscriptions.id'), index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    subscription_id = db.Column(UUIDType(), db.ForeignKey('subscriptions.id', ondelete='SET NULL'))
     
     # Payment details
-    amount_zar = db.Column(db.Numeric(10, 2), nullable=False)
+    amount_zar = db.Column(MoneyCents(), nullable=False)
     currency = db.Column(db.String(3), default='ZAR')
     payment_method = db.Column(db.String(50), nullable=False)
     payment_gateway = db.Column(db.String(50), default='fnb')
@@ -297,129 +511,181 @@ class Payment(db.Model):
     fnb_reference = db.Column(db.String(100))
     
     # Status
-    status = db.Column(db.String(20), default='pending')  # pending, completed, failed, refunded, disputed
+    status = db.Column(Vocab('pending', 'completed', 'failed', 'refunded', 'disputed'), default='pending')
     failure_reason = db.Column(db.Text)
     
     # Distribution (for FNB accounts)
-    distribution = db.Column(db.JSON)  # Store payout distribution to different accounts
+    distribution = db.deferred(db.Column(_JSON))  # Payout split; deferred - list views never read it
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
     
     # Relationships
-    subscription = db.relationship('Subscription', backref='payments')
+    user = db.relationship('User', back_populates='payments')
+    subscription = db.relationship('Subscription', back_populates='payments')
+    
+    # Revenue aggregates filter on status and bucket by creation time;
+    # the per-user and per-subscription composites cover the FK lookups.
+    # Inserts arrive in time order, so a BRIN summary (Postgres-only
+    # kwargs, plain index elsewhere) serves bare time-range sweeps
+    __table_args__ = (
+        db.Index('idx_payment_status_created', 'status', 'created_at'),
+        db.Index('ix_pay_user_status_created', 'user_id', 'status', 'created_at'),
+        db.Index('ix_pay_sub_status', 'subscription_id', 'status'),
+        db.Index('ix_pay_created_brin', 'created_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     def __repr__(self):
-        return f'<Payment {self.amount_zar} {self.currency} by {self.user_id}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class SupportTicket(db.Model):
     __tablename__ = 'support_tickets'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
     # Ticket details
     subject = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(50))  # technical, billing, content, account, general
-    priority = db.Column(db.String(20), default='medium')  # low, medium, high, urgent
+    priority = db.Column(Vocab('low', 'medium', 'high', 'urgent'), default='medium')
     
     # Status
-    status = db.Column(db.String(20), default='open')  # open, in_progress, resolved, closed
-    assigned_to = db.Column(db.String(36))  # AI agent or human support agent ID
+    status = db.Column(Vocab('open', 'in_progress', 'resolved', 'closed'), default='open')
+    # Assignment: assigned_to says which kind of handler owns the ticket;
+    # when a human owns it, assigned_user_id is the indexed FK used by
+    # "my assigned tickets" queues
+    assigned_to = db.Column(Vocab('ai_agent', 'human_support'))
+    assigned_user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='SET NULL'), index=True)
     resolution_notes = db.Column(db.Text)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     resolved_at = db.Column(db.DateTime)
     closed_at = db.Column(db.DateTime)
     
     # Relationships
-    messages = db.relationship('SupportMessage', backref='ticket', lazy=True, cascade='all, delete-orphan')
+    user = db.relationship('User', back_populates='support_tickets')
+    messages = db.relationship('SupportMessage', back_populates='ticket', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    
+    # The support page lists a user's tickets newest-first; agent queues
+    # filter open tickets by priority
+    __table_args__ = (
+        db.Index('idx_ticket_user_created', 'user_id', 'created_at'),
+        db.Index('ix_ticket_status_priority_created', 'status', 'priority', 'created_at'),
+    )
     
     def __repr__(self):
-        return f'<SupportTicket {self.subject} - {self.status}>'
+        return f'<{type(self).__name__} {self.id}>'
 
-class SupportMessage(db.Model):
+class SupportMessage(_KeysetMixin, _BulkCreateMixin, db.Model):
     __tablename__ = 'support_messages'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    ticket_id = db.Column(db.String(36), db.ForeignKey('support_tickets.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    ticket_id = db.Column(UUIDType(), db.ForeignKey('support_tickets.id', ondelete='CASCADE'), nullable=False, index=True)
     
     # Message content
     message = db.Column(db.Text, nullable=False)
     is_from_user = db.Column(db.Boolean, default=True)
-    sender_type = db.Column(db.String(20), default='user')  # user, ai_agent, human_agent
-    sender_id = db.Column(db.String(36))  # ID of the sender (user or agent)
+    sender_type = db.Column(Vocab('user', 'ai_agent', 'human_agent'), default='user')
+    # Typed sender: NULL for AI agents, FK for user/human-agent senders
+    sender_user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='SET NULL'), index=True)
     
     # Attachments
-    attachments = db.Column(db.JSON)  # JSON list of attachment URLs
+    attachments = db.Column(_JSON)  # JSON list of attachment URLs
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    
+    # Relationships
+    ticket = db.relationship('SupportTicket', back_populates='messages')
+    
+    # Append-only; BRIN keeps time-range scans cache-resident
+    __table_args__ = (
+        db.Index('ix_support_msg_created_brin', 'created_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     def __repr__(self):
-        return f'<SupportMessage ticket:{self.ticket_id} from:{self.sender_type}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class ChatConversation(db.Model):
     __tablename__ = 'chat_conversations'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType(), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
     # Conversation details
     title = db.Column(db.String(200))
     context = db.Column(db.Text)  # Conversation context or summary
     
     # Status
-    status = db.Column(db.String(20), default='active')  # active, closed, archived
+    status = db.Column(Vocab('active', 'closed', 'archived'), default='active')
     
     # Timestamps
-    started_at = db.Column(db.DateTime, default=datetime.utcnow)
-    last_activity = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, server_default=db.func.now())
+    last_activity = db.Column(db.DateTime, server_default=db.func.now())
     closed_at = db.Column(db.DateTime)
     
     # Relationships
-    messages = db.relationship('ChatMessage', backref='conversation', lazy=True, cascade='all, delete-orphan')
+    user = db.relationship('User', back_populates='chat_conversations')
+    messages = db.relationship('ChatMessage', back_populates='conversation', lazy='raise_on_sql', cascade='all, delete-orphan', passive_deletes=True)
+    
+    # The chat page lists a user's conversations by recency
+    __table_args__ = (
+        db.Index('idx_chat_user_activity', 'user_id', 'last_activity'),
+    )
     
     def __repr__(self):
-        return f'<ChatConversation user:{self.user_id}>'
+        return f'<{type(self).__name__} {self.id}>'
 
-class ChatMessage(db.Model):
+class ChatMessage(_KeysetMixin, _BulkCreateMixin, db.Model):
     __tablename__ = 'chat_messages'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    conversation_id = db.Column(db.String(36), db.ForeignKey('chat_conversations.id'), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    conversation_id = db.Column(UUIDType(), db.ForeignKey('chat_conversations.id', ondelete='CASCADE'), nullable=False)
     
     # Message content
     message = db.Column(db.Text, nullable=False)
     is_user = db.Column(db.Boolean, default=True)
-    message_type = db.Column(db.String(20), default='text')  # text, image, suggestion, system
+    message_type = db.Column(Vocab('text', 'image', 'suggestion', 'system'), default='text')
     intent = db.Column(db.String(50))  # Detected intent of the message
     
     # Metadata
-    suggestions = db.Column(db.JSON)  # JSON list of suggested responses
+    suggestions = db.Column(_JSON)  # JSON list of suggested responses
     confidence = db.Column(db.Numeric(3, 2))  # Confidence score for AI responses
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    
+    # Relationships
+    conversation = db.relationship('ChatConversation', back_populates='messages')
+    
+    # Message-list pagination reads a conversation in creation order;
+    # the BRIN summary covers whole-table time sweeps cheaply
+    __table_args__ = (
+        db.Index('ix_chat_conv_created', 'conversation_id', 'created_at'),
+        db.Index('ix_chat_msg_created_brin', 'created_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     def __repr__(self):
-        return f'<ChatMessage conv:{self.conversation_id} user:{self.is_user}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class RevenueTracking(db.Model):
     __tablename__ = 'revenue_tracking'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    date = db.Column(db.Date, nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    date = db.Column(db.Date, nullable=False)
     
     # Revenue metrics
-    total_revenue_zar = db.Column(db.Numeric(12, 2), default=0)
-    recurring_revenue_zar = db.Column(db.Numeric(12, 2), default=0)
-    one_time_revenue_zar = db.Column(db.Numeric(12, 2), default=0)
+    total_revenue_zar = db.Column(MoneyCents(), default=0)
+    recurring_revenue_zar = db.Column(MoneyCents(), default=0)
+    one_time_revenue_zar = db.Column(MoneyCents(), default=0)
     
     # Subscription metrics
     new_subscriptions = db.Column(db.Integer, default=0)
@@ -438,8 +704,8 @@ class RevenueTracking(db.Model):
     average_rating = db.Column(db.Numeric(3, 2), default=0.0)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=datetime.utcnow)
     
     # Unique constraint on date
     __table_args__ = (
@@ -447,51 +713,119 @@ class RevenueTracking(db.Model):
     )
     
     def __repr__(self):
-        return f'<RevenueTracking {self.date} - ZAR {self.total_revenue_zar}>'
+        return f'<{type(self).__name__} {self.id}>'
 
 class SystemHealth(db.Model):
     __tablename__ = 'system_health'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
     component = db.Column(db.String(50), nullable=False, index=True)
-    status = db.Column(db.String(20), nullable=False)  # healthy, warning, critical, offline
+    status = db.Column(Vocab('healthy', 'warning', 'critical', 'offline'), nullable=False)
     status_message = db.Column(db.Text)
     
     # Metrics
-    metrics = db.Column(db.JSON)  # JSON object with component-specific metrics
+    metrics = db.Column(_JSON)  # JSON object with component-specific metrics
     performance_score = db.Column(db.Numeric(5, 2))  # 0-100 score
     
     # Timestamps
-    last_checked = db.Column(db.DateTime, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_checked = db.Column(db.DateTime, server_default=db.func.now())
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    
+    # GIN lets key/path probes into the metrics blob use an index
+    __table_args__ = (
+        db.Index('ix_health_metrics_gin', 'metrics', postgresql_using='gin'),
+    )
     
     def __repr__(self):
-        return f'<SystemHealth {self.component} - {self.status}>'
+        return f'<{type(self).__name__} {self.id}>'
 
-class AIAgentLog(db.Model):
+class AIAgentLog(_KeysetMixin, _BulkCreateMixin, db.Model):
     __tablename__ = 'ai_agent_logs'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    agent_name = db.Column(db.String(50), nullable=False, index=True)
+    id = db.Column(UUIDType(), primary_key=True, default=generate_uuid)
+    agent_name = db.Column(db.String(50), nullable=False)
     task_type = db.Column(db.String(50), nullable=False)
     
     # Task details
-    task_parameters = db.Column(db.JSON)
-    task_result = db.Column(db.JSON)
-    status = db.Column(db.String(20), default='completed')  # pending, running, completed, failed
+    task_parameters = db.deferred(db.Column(_JSON))
+    task_result = db.deferred(db.Column(_JSON))
+    status = db.Column(Vocab('pending', 'running', 'completed', 'failed'), default='completed')
     error_message = db.Column(db.Text)
     
     # Performance metrics
     execution_time_ms = db.Column(db.Integer)
-    resource_usage = db.Column(db.JSON)
+    resource_usage = db.deferred(db.Column(_JSON))
     
     # Timestamps
-    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, server_default=db.func.now())
     completed_at = db.Column(db.DateTime)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    
+    # "Recent activity for agent X" reads prune to a time range
+    __table_args__ = (
+        db.Index('ix_ailog_agent_created', 'agent_name', 'created_at'),
+        db.Index('ix_ailog_created_brin', 'created_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        # jsonb_path_ops: containment-only queries, about a third the size
+        db.Index('ix_ailog_params_gin', 'task_parameters',
+                 postgresql_using='gin',
+                 postgresql_ops={'task_parameters': 'jsonb_path_ops'}),
+    )
     
     def __repr__(self):
-        return f'<AIAgentLog {self.agent_name} - {self.task_type}>'
+        return f'<{type(self).__name__} {self.id}>'
+
+# Counter caches: single-row atomic UPDATEs keep the Course aggregates
+# fresh so catalogue and detail pages never re-COUNT subscriptions or
+# re-AVG reviews
+
+@event.listens_for(Subscription, 'after_insert')
+def _course_student_added(mapper, connection, target):
+    connection.execute(
+        db.update(Course)
+        .where(Course.id == target.course_id)
+        .values(total_students=Course.total_students + 1)
+    )
+
+@event.listens_for(Subscription, 'after_delete')
+def _course_student_removed(mapper, connection, target):
+    connection.execute(
+        db.update(Course)
+        .where(Course.id == target.course_id)
+        .values(total_students=Course.total_students - 1)
+    )
+
+def _apply_rating_delta(connection, course_id, rating_delta, count_delta):
+    new_sum = Course.rating_sum + rating_delta
+    new_count = Course.review_count + count_delta
+    connection.execute(
+        db.update(Course)
+        .where(Course.id == course_id)
+        .values(
+            rating_sum=new_sum,
+            review_count=new_count,
+            total_rating=db.case(
+                (new_count > 0, db.cast(new_sum, db.Numeric(10, 2)) / new_count),
+                else_=0,
+            ),
+        )
+    )
+
+@event.listens_for(CourseReview, 'after_insert')
+def _course_review_added(mapper, connection, target):
+    _apply_rating_delta(connection, target.course_id, target.rating, 1)
+
+@event.listens_for(CourseReview, 'after_delete')
+def _course_review_removed(mapper, connection, target):
+    _apply_rating_delta(connection, target.course_id, -target.rating, -1)
+
+@event.listens_for(CourseReview, 'after_update')
+def _course_review_changed(mapper, connection, target):
+    history = db.inspect(target).attrs.rating.history
+    if history.has_changes() and history.deleted:
+        _apply_rating_delta(
+            connection, target.course_id, target.rating - history.deleted[0], 0
+        )
 
 # Import all models for easy access
 __all__ = [